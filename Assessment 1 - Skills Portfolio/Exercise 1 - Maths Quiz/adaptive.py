@@ -0,0 +1,180 @@
+from array import array
+import os
+import random
+
+# Folder this script lives in
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Where every student's skill ratings are saved
+RATINGS_FILE = os.path.join(script_dir, "adaptive_ratings.bin")
+
+# Digit counts the adaptive mode can ask about (Easy = 1, Moderate = 2,
+# Advanced = 4 in the normal quiz)
+DIGIT_LEVELS = (1, 2, 3, 4)
+
+OPERATIONS = ("+", "-")
+
+# A new student starts at this rating for each operation
+START_RATING = 1000
+
+# How fast ratings move after each answer (Elo K-factor). New students
+# move faster so the first few quizzes find their level quickly.
+K_FACTOR = 32
+NEW_STUDENT_K_FACTOR = 100
+NEW_STUDENT_ANSWERS = 15
+
+# Chance of getting a question right first time that the adaptive mode
+# aims for
+TARGET_CHANCE = 0.7
+
+# How strongly the weaker operation is favoured. An operation rated this
+# much lower than another is asked about 10 times as often; equal ratings
+# give 50/50 like decideOperation
+OPERATION_SPREAD = 800
+
+# A student's state is four 16-bit numbers:
+# [rating for +, rating for -, answers to +, answers to -]
+STATE_LENGTH = len(OPERATIONS) * 2
+
+# Student codes are 1000-9999, so each code has its own fixed slot in
+# the ratings file and one student can be read or written on their own
+FIRST_CODE = 1000
+LAST_CODE = 9999
+RECORD_SIZE = STATE_LENGTH * 2
+
+# ============================================================================
+# RATINGS
+# ============================================================================
+
+def item_rating(operation, digits):
+    """
+    How hard a kind of question is, on the same scale as the students.
+    Each extra digit is harder, and subtraction is a little harder than
+    addition.
+    """
+    return 800 + 200 * digits + (50 if operation == "-" else 0)
+
+
+def chance_correct(student_rating, operation, digits):
+    """
+    Elo expected score: the chance a student with this rating gets a
+    question of this kind right first time.
+    """
+    return 1 / (1 + 10 ** ((item_rating(operation, digits) - student_rating) / 400))
+
+
+def new_state():
+    """
+    Returns the state for a student with no history.
+    """
+    return array("h", [START_RATING] * len(OPERATIONS) + [0] * len(OPERATIONS))
+
+
+def operation_weights(state):
+    """
+    Returns how likely each operation is to be picked next. The lower
+    a student's rating for an operation, the more often it comes up, so
+    practice goes where it is needed most.
+    """
+    return [10 ** (-state[index] / OPERATION_SPREAD) for index in range(len(OPERATIONS))]
+
+
+def choose_question(state, generator=random):
+    """
+    Picks the next question's operation, weighted towards the student's
+    weaker operation, and the digit count whose chance of a right answer,
+    for this student and operation, is closest to TARGET_CHANCE.
+    Returns (operation, digits).
+    """
+    operation = generator.choices(OPERATIONS, operation_weights(state))[0]
+    rating = state[OPERATIONS.index(operation)]
+    digits = min(DIGIT_LEVELS,
+                 key=lambda level: abs(chance_correct(rating, operation, level) - TARGET_CHANCE))
+    return operation, digits
+
+
+def update_state(state, operation, digits, outcome):
+    """
+    Updates a student's rating for one operation after a question.
+    Only a couple of numbers change, so this takes constant time.
+
+    Parameters:
+        state: The student's state (changed in place)
+        operation: '+' or '-'
+        digits: Digit count of the question
+        outcome: 1 for right first time, 0.5 for right on the second
+                 attempt, 0 for wrong both times
+    """
+    index = OPERATIONS.index(operation)
+    count_index = len(OPERATIONS) + index
+
+    if state[count_index] < NEW_STUDENT_ANSWERS:
+        k_factor = NEW_STUDENT_K_FACTOR
+    else:
+        k_factor = K_FACTOR
+
+    change = k_factor * (outcome - chance_correct(state[index], operation, digits))
+    state[index] = max(0, min(3000, round(state[index] + change)))
+    state[count_index] = min(32767, state[count_index] + 1)
+
+
+def random_operands(digits, generator=random):
+    """
+    Returns two random numbers with the given number of digits
+    (1 digit is 1-9 like Easy mode).
+    """
+    low = 1 if digits == 1 else 10 ** (digits - 1)
+    high = 10 ** digits - 1
+    return generator.randint(low, high), generator.randint(low, high)
+
+
+def level_name(digits):
+    """
+    Returns the normal quiz difficulty closest to a digit count, used to
+    pick the background.
+    """
+    if digits == 1:
+        return "Easy"
+    elif digits == 2:
+        return "Moderate"
+    return "Advanced"
+
+
+# ============================================================================
+# SAVED RATINGS
+# ============================================================================
+
+def load_state(student_code, filename=RATINGS_FILE):
+    """
+    Reads one student's state from their slot in the ratings file.
+    Students not saved yet (or with no code) get the starting state.
+    """
+    if student_code is None or not FIRST_CODE <= student_code <= LAST_CODE:
+        return new_state()
+
+    state = array("h")
+    try:
+        with open(filename, "rb") as file:
+            file.seek((student_code - FIRST_CODE) * RECORD_SIZE)
+            state.frombytes(file.read(RECORD_SIZE))
+    except (OSError, ValueError):
+        return new_state()
+
+    # An empty or all-zero slot means the student has no history yet
+    if len(state) != STATE_LENGTH or not any(state):
+        return new_state()
+    return state
+
+
+def save_state(student_code, state, filename=RATINGS_FILE):
+    """
+    Writes one student's state into their slot without touching
+    anyone else's.
+    """
+    if student_code is None or not FIRST_CODE <= student_code <= LAST_CODE:
+        return
+
+    mode = "r+b" if os.path.exists(filename) else "w+b"
+    with open(filename, mode) as file:
+        file.seek((student_code - FIRST_CODE) * RECORD_SIZE)
+        file.write(state.tobytes())
@@ -2,70 +2,86 @@ from tkinter import *
 from tkinter import messagebox
 import random
 import os
-
-# Change working directory to where this script is located
-# This make sures images folder is found correctly
+import sys
+import quizexport
+import adaptive
+from questionset import QuestionSet
+from scoring import ATTEMPT_POINTS, QUESTIONS_PER_QUIZ, get_rank, points_for_attempt
+
+# Folder this script is located in
+# Images are loaded from here so it works from any working directory
 script_dir = os.path.dirname(os.path.abspath(__file__))
-os.chdir(script_dir)
 
-# This is to import PIL for images 
-try:
-    from PIL import Image, ImageTk
-    PIL_AVAILABLE = True
-except:
-    PIL_AVAILABLE = False
+# The shared image cache is in the folder above the exercises
+portfolio_dir = os.path.dirname(script_dir)
+if portfolio_dir not in sys.path:
+    sys.path.append(portfolio_dir)
+import assetcache
+import sessionrecorder
+
+# Size background images are scaled to
+WINDOW_SIZE = (700, 500)
 
-# Create main window
-root = Tk()
-root.title("Maths Quiz")
-root.geometry("700x500")
-root.resizable(False, False)
+# Main window and frames, created by build_app()
+root = None
+home_frame = None
+task_frame = None
 
-# Store image references
-image_references = {}
+# What the Exit button on the results screen does (root.quit by default)
+exit_command = None
 
 # Global variables
-current_questions = []
+current_questions = QuestionSet()
 current_index = 0
 current_score = 0
 current_difficulty = ""
 current_attempt = 1
 
+# Optional student code, used to save results for the Student Manager
+student_code_var = None
+
+# Adaptive mode: the student's skill ratings and the digit count of the
+# question on screen
+adaptive_state = None
+current_digits = 0
+
 # ============================================================================
-# IMAGE LOADING HELPER FUNCTION
+# IMAGE LOADING HELPER FUNCTIONS
 # ============================================================================
 
+def image_path(image_filename):
+    """
+    Returns the full path of an image in the 'images' folder
+    """
+    return os.path.join(script_dir, "images", image_filename)
+
+
 def load_background_image(frame, image_filename, fallback_color):
     """
     Loads a background image if available, otherwise uses fallback color.
     
+    The fallback color is shown straight away. The image comes from the
+    shared asset cache on a background thread, so the screen is drawn
+    without waiting for it, and appears behind the widgets once ready.
+    
     Parameters:
         frame: The frame to add background to
         image_filename: Name of the image file (put in 'images' folder)
         fallback_color: Color to use if image not found
     """
-    if PIL_AVAILABLE:
-        try:
-            # Try to load image from 'images' folder
-            img = Image.open(f"images/{image_filename}")
-            img = img.resize((700, 500))
-            photo = ImageTk.PhotoImage(img)
-            
-            # Store reference to prevent deleting
-            image_references[image_filename] = photo
-            
-            # Create label with image
-            bg_label = Label(frame, image=photo)
-            bg_label.place(x=0, y=0, relwidth=1, relheight=1)
-            
-            return True
-        except:
-            frame.config(bg=fallback_color)
-            return False
-    else:
-        # PIL not available, use color
-        frame.config(bg=fallback_color)
-        return False
+    frame.config(bg=fallback_color)
+    
+    # Label that will hold the image, created first so it stays at the back
+    bg_label = Label(frame, bg=fallback_color, bd=0)
+    bg_label.place(x=0, y=0, relwidth=1, relheight=1)
+    
+    def show_image(photo):
+        # The screen may have been cleared while the image was loading
+        if photo is not None and bg_label.winfo_exists():
+            bg_label.config(image=photo)
+    
+    assetcache.load_photo_async(frame, image_path(image_filename),
+                                WINDOW_SIZE, show_image)
 
 
 # ============================================================================
@@ -121,13 +137,23 @@ def displayMenu():
                           command=lambda: start_quiz("Advanced"))
     advanced_btn.pack(pady=10)
     
-    # Instructions button
-    info_btn = Button(task_frame, text="Instructions", 
+    # Adaptive and Instructions buttons side by side
+    extra_frame = Frame(task_frame, bg="#e0f2fe")
+    extra_frame.pack(pady=20)
+    
+    adaptive_btn = Button(extra_frame, text="4. Adaptive", 
+                          font=("Arial", 11, "bold"),
+                          bg="#8b5cf6", fg="white", 
+                          width=15,
+                          command=lambda: start_quiz("Adaptive"))
+    adaptive_btn.grid(row=0, column=0, padx=5)
+    
+    info_btn = Button(extra_frame, text="Instructions", 
                       font=("Arial", 11),
                       bg="#60a5fa", fg="white", 
                       width=15,
                       command=show_instructions)
-    info_btn.pack(pady=20)
+    info_btn.grid(row=0, column=1, padx=5)
     
     # Back to home button
     home_btn = Button(task_frame, text="Back to Home", 
@@ -135,6 +161,14 @@ def displayMenu():
                       bg="#94a3b8", fg="white",
                       command=lambda: show_frame(home_frame))
     home_btn.place(x=20, y=450)
+    
+    # Student code (optional) so results can be exported to the marks file
+    Label(task_frame, text="Student Code:", 
+          font=("Arial", 10),
+          bg="#e0f2fe", fg="#075985").place(x=470, y=452)
+    Entry(task_frame, textvariable=student_code_var, 
+          font=("Arial", 10), 
+          width=8).place(x=570, y=452)
 
 
 def randomInt(difficulty):
@@ -181,27 +215,11 @@ def displayResults(score):
     # Load results background image or use color
     load_background_image(task_frame, "results_background.jpg", "#f0fdf4")
     
-    # Calculate rank
-    if score >= 90:
-        rank = "A+"
-        message = "Outstanding!"
-        color = "#059669"
-    elif score >= 80:
-        rank = "A"
-        message = "Excellent!"
-        color = "#0891b2"
-    elif score >= 70:
-        rank = "B"
-        message = "Good job!"
-        color = "#7c3aed"
-    elif score >= 60:
-        rank = "C"
-        message = "Not bad!"
-        color = "#ea580c"
-    else:
-        rank = "D"
-        message = "Keep practicing!"
-        color = "#dc2626"
+    # Save the result if a student code was entered
+    save_session(score)
+    
+    # Calculate rank (bands are in scoring.py)
+    rank, message, color = get_rank(score)
     
     # Results display
     Label(task_frame, text="Quiz Completed!", 
@@ -231,7 +249,7 @@ def displayResults(score):
            font=("Arial", 12),
            bg="#ef4444", fg="white", 
            width=15,
-           command=root.quit).pack(pady=5)
+           command=exit_command).pack(pady=5)
 
 
 # ============================================================================
@@ -253,6 +271,59 @@ def show_frame(frame):
     frame.tkraise()
 
 
+def get_student_code():
+    """
+    Returns the student code entered on the difficulty menu, or None if
+    it is empty or not a valid code (1000-9999)
+    """
+    if student_code_var is None:
+        return None  # No menu built, e.g. a headless replay
+    code = student_code_var.get().strip()
+    if code.isdigit() and 1000 <= int(code) <= 9999:
+        return int(code)
+    return None
+
+
+def save_session(score):
+    """
+    Adds this quiz to the sessions file if a student code was entered
+    """
+    code = get_student_code()
+    if code is not None:
+        try:
+            quizexport.append_session(code, current_difficulty, score)
+        except OSError:
+            pass  # Saving is optional, the quiz still works without it
+
+
+def add_adaptive_question():
+    """
+    Adaptive mode: picks the next question from the student's ratings
+    """
+    global current_digits
+    operation, current_digits = adaptive.choose_question(adaptive_state)
+    num1, num2 = adaptive.random_operands(current_digits)
+    current_questions.add(num1, operation, num2)
+
+
+def record_adaptive_answer(question_index, points):
+    """
+    Adaptive mode: updates the student's rating for the kind of
+    question that was answered (1 for full points, 0.5 for half, 0 for
+    none) and saves it
+    """
+    if current_difficulty != "Adaptive":
+        return
+    
+    operation = chr(current_questions.operations[question_index])
+    outcome = points / ATTEMPT_POINTS[0]
+    adaptive.update_state(adaptive_state, operation, current_digits, outcome)
+    try:
+        adaptive.save_state(get_student_code(), adaptive_state)
+    except OSError:
+        pass  # The ratings still work for this quiz without saving
+
+
 def replay_quiz():
     """
     Resets quiz and goes back to difficulty menu
@@ -275,6 +346,9 @@ def show_instructions():
        - Easy: Single digit (1-9)
        - Moderate: Double digit (10-99)
        - Advanced: Four digit (1000-9999)
+       - Adaptive: Questions get harder or easier
+         as you answer (enter your student code
+         to keep your level between quizzes)
     
     2. Answer 10 math questions
     
@@ -310,27 +384,74 @@ def confirm_exit():
 def start_quiz(difficulty):
     """
     Starts the quiz with selected difficulty
-    Generates 10 questions
+    """
+    sessionrecorder.record("difficulty", difficulty)
+    new_quiz(difficulty)
+    
+    # Show first question
+    show_question()
+
+
+def new_quiz(difficulty):
+    """
+    Resets the quiz for a new game at difficulty
+    Generates 10 questions (adaptive mode makes each one when needed)
     """
     global current_questions, current_index, current_score, current_difficulty, current_attempt
+    global adaptive_state
     
     # Reset variables
-    current_questions = []
+    current_questions = QuestionSet()
     current_index = 0
     current_score = 0
     current_difficulty = difficulty
     current_attempt = 1
     
+    if difficulty == "Adaptive":
+        adaptive_state = adaptive.load_state(get_student_code())
+        return
+    
     # Generate 10 questions
-    for i in range(10):
+    for i in range(QUESTIONS_PER_QUIZ):
         num1, num2 = randomInt(difficulty)
         operation = decideOperation()
-        question = f"{num1} {operation} {num2}"
-        answer = eval(question)  # Calculate correct answer
-        current_questions.append((question, answer))
+        current_questions.add(num1, operation, num2)  # Answer is worked out when asked
+
+
+def current_question():
+    """
+    Returns (question, answer) for the question being asked
+    Adaptive mode picks each question when it is needed
+    """
+    if current_difficulty == "Adaptive" and current_index == len(current_questions):
+        add_adaptive_question()
+    return current_questions[current_index]
+
+
+def mark_answer(question_index, user_answer, correct_answer):
+    """
+    Scores one attempt at the question at question_index and moves on
+    to the next question once it is answered or out of attempts
+    Returns (correct, points, finished)
+    """
+    global current_index, current_score, current_attempt
     
-    # Show first question
-    show_question()
+    correct = isCorrect(user_answer, correct_answer)
+    sessionrecorder.record("answer", f"{int(correct)} {user_answer}")
+    
+    if correct:
+        points = points_for_attempt(current_attempt)
+        current_score += points
+    else:
+        points = 0
+        current_attempt += 1
+        if current_attempt <= len(ATTEMPT_POINTS):
+            return False, 0, False  # Another attempt is allowed
+    
+    record_adaptive_answer(question_index, points)
+    current_attempt = 1  # Reset attempt for next question
+    current_index += 1
+    return correct, points, True
 
 
 def show_question():
@@ -340,20 +461,26 @@ def show_question():
     global current_attempt
     
     # Check if quiz is finished
-    if current_index >= len(current_questions):
+    if current_index >= QUESTIONS_PER_QUIZ:
         displayResults(current_score)
         return
     
+    # Get current question
+    question_index = current_index
+    question, correct_answer = current_question()
+    
     # Clear screen
     clear_screen()
     
-    # Get current question
-    question, correct_answer = current_questions[current_index]
-    
     # Load background image based on difficulty or use color
-    if current_difficulty == "Easy":
+    # (adaptive mode uses the level closest to the question's digits)
+    level = current_difficulty
+    if level == "Adaptive":
+        level = adaptive.level_name(current_digits)
+    
+    if level == "Easy":
         load_background_image(task_frame, "easy_background.png", "#dcfce7")
-    elif current_difficulty == "Moderate":
+    elif level == "Moderate":
         load_background_image(task_frame, "moderate_background.jpg", "#fef3c7")
     else:
         load_background_image(task_frame, "advanced_background.jpg", "#fee2e2")
@@ -392,7 +519,9 @@ def show_question():
     
     # Submit function
     def submit_answer():
-        global current_index, current_score, current_attempt
+        # Ignore extra submits while waiting to move to the next question
+        if str(answer_entry.cget("state")) == DISABLED:
+            return
         
         # Get user input
         try:
@@ -402,24 +531,22 @@ def show_question():
             return
         
         # Check answer
-        if isCorrect(user_answer, correct_answer):
+        attempt = current_attempt
+        correct, points, finished = mark_answer(question_index, user_answer, correct_answer)
+        if correct:
             # Correct answer
-            if current_attempt == 1:
-                current_score += 10
-                feedback_label.config(text="Correct! +10 points", fg="#059669")
+            if attempt == 1:
+                feedback_label.config(text=f"Correct! +{points} points", fg="#059669")
             else:
-                current_score += 5
-                feedback_label.config(text="Correct! +5 points", fg="#0891b2")
+                feedback_label.config(text=f"Correct! +{points} points", fg="#0891b2")
             
             # Move to next question after 1 second
-            current_attempt = 1  # Reset attempt for next question
-            current_index += 1
+            answer_entry.config(state=DISABLED)
+            submit_button.config(state=DISABLED)
             root.after(1000, show_question)
         else:
             # Wrong answer
-            current_attempt += 1
-            
-            if current_attempt <= 2:
+            if not finished:
                 # Give second chance
                 feedback_label.config(text="Incorrect! Try again", fg="#dc2626")
                 answer_entry.delete(0, END)
@@ -430,16 +557,17 @@ def show_question():
             else:
                 # No more attempts
                 feedback_label.config(text=f"Wrong! Answer was {correct_answer}", fg="#dc2626")
-                current_attempt = 1  # Reset for next question
-                current_index += 1
+                answer_entry.config(state=DISABLED)
+                submit_button.config(state=DISABLED)
                 root.after(2000, show_question)
     
     # Submit button
-    Button(task_frame, text="Submit Answer", 
-           font=("Arial", 14, "bold"),
-           bg="#3b82f6", fg="white",
-           width=15, height=2,
-           command=submit_answer).pack(pady=10)
+    submit_button = Button(task_frame, text="Submit Answer", 
+                           font=("Arial", 14, "bold"),
+                           bg="#3b82f6", fg="white",
+                           width=15, height=2,
+                           command=submit_answer)
+    submit_button.pack(pady=10)
     
     # Exit button
     Button(task_frame, text="Exit Quiz", 
@@ -453,100 +581,136 @@ def show_question():
 
 
 # ============================================================================
-# CREATE FRAMES
+# BUILD THE APP
 # ============================================================================
 
-# Home frame
-home_frame = Frame(root, bg="#dbeafe")
-home_frame.place(relwidth=1, relheight=1)
-
-# Task frame (for quiz)
-task_frame = Frame(root)
-task_frame.place(relwidth=1, relheight=1)
+def build_app(parent, on_exit=None):
+    """
+    Creates the quiz frames inside parent. Used by main() with its own
+    window and by the launcher with a shared one.
+    
+    Parameters:
+        parent: Window or frame to build the quiz in (700x500)
+        on_exit: What the Exit button does (defaults to closing the window)
+    """
+    global root, home_frame, task_frame, exit_command, student_code_var
+    
+    root = parent.winfo_toplevel()
+    exit_command = on_exit or root.quit
+    student_code_var = StringVar(master=root)
+    
+    # ---- Create frames ----
+
+    # Home frame
+    home_frame = Frame(parent, bg="#dbeafe")
+    home_frame.place(relwidth=1, relheight=1)
+
+    # Task frame (for quiz)
+    task_frame = Frame(parent)
+    task_frame.place(relwidth=1, relheight=1)
+
+    # ---- Home screen with math decorations ----
+
+    # Create canvas first
+    home_canvas = Canvas(home_frame, width=700, height=500, bg="#dbeafe", highlightthickness=0)
+    home_canvas.pack(fill=BOTH, expand=True)
+
+    # Try to load home background image on canvas (behind everything else)
+    def show_home_image(photo):
+        if photo is not None:
+            item = home_canvas.create_image(0, 0, image=photo, anchor=NW)
+            home_canvas.tag_lower(item)
+    
+    assetcache.load_photo_async(home_canvas, image_path("home_background.png"),
+                                WINDOW_SIZE, show_home_image)
+
+    # Add floating math symbols in background
+    math_symbols = [
+        ("+", 80, 100, 30, "#3b82f6"),
+        ("-", 600, 120, 30, "#8b5cf6"),
+        ("×", 120, 350, 28, "#10b981"),
+        ("÷", 580, 380, 28, "#f59e0b"),
+        ("=", 100, 250, 25, "#ec4899"),
+        ("π", 600, 280, 32, "#06b6d4"),
+        ("+", 150, 450, 24, "#a78bfa"),
+        ("√", 620, 200, 26, "#14b8a6"),
+        ("∑", 50, 180, 30, "#f97316"),
+        ("∞", 650, 450, 28, "#84cc16"),
+    ]
+
+    for symbol, x, y, size, color in math_symbols:
+        home_canvas.create_text(x, y, text=symbol, 
+                               font=("Arial", size, "bold"), 
+                               fill=color, 
+                               stipple="gray50")  
+
+    # Add math equation decorations
+    equations = [
+        ("2+2=4", 70, 420, "#64748b"),
+        ("5×3=15", 600, 50, "#64748b"),
+    ]
+
+    for eq, x, y, color in equations:
+        home_canvas.create_text(x, y, text=eq, 
+                               font=("Arial", 12), 
+                               fill=color,
+                               stipple="gray50")
+
+    # Main title
+    home_canvas.create_text(350, 100, text="Maths Quiz", 
+                           font=("Arial", 40, "bold"),
+                           fill="#1e3a8a")
 
-# ============================================================================
-# HOME SCREEN WITH MATH DECORATIONS
-# ============================================================================
+    # Subtitle
+    home_canvas.create_text(350, 160, text="Test Your Arithmetic Skills!", 
+                           font=("Arial", 16),
+                           fill="#1e40af")
+
+    # Description
+    home_canvas.create_text(350, 195, text="Answer 10 questions and get ranked!", 
+                           font=("Arial", 13),
+                           fill="#475569")
+
+    # Start button on canvas
+    Button(home_frame, text="Start Quiz", 
+           font=("Arial", 16, "bold"),
+           bg="#10b981", fg="white",
+           width=15, height=2,
+           command=lambda: [displayMenu(), show_frame(task_frame)]).place(x=250, y=240)
 
-# Create canvas first
-home_canvas = Canvas(home_frame, width=700, height=500, bg="#dbeafe", highlightthickness=0)
-home_canvas.pack(fill=BOTH, expand=True)
+    # Instructions button
+    Button(home_frame, text="Instructions", 
+           font=("Arial", 12),
+           bg="#3b82f6", fg="white",
+           width=12,
+           command=show_instructions).place(x=290, y=330)
+    
+    # Exit button (back to the launcher when opened from there)
+    Button(home_frame, text="Exit", 
+           font=("Arial", 12),
+           bg="#ef4444", fg="white",
+           width=12,
+           command=exit_command).place(x=290, y=380)
+    
+    show_frame(home_frame)
 
-# Try to load home background image on canvas
-if PIL_AVAILABLE:
-    try:
-        img = Image.open("images/home_background.png")
-        img = img.resize((700, 500))
-        photo = ImageTk.PhotoImage(img)
-        image_references['home_bg'] = photo
-        home_canvas.create_image(0, 0, image=photo, anchor=NW)
-    except:
-        pass  # Use default canvas color
-
-# Add floating math symbols in background
-math_symbols = [
-    ("+", 80, 100, 30, "#3b82f6"),
-    ("-", 600, 120, 30, "#8b5cf6"),
-    ("×", 120, 350, 28, "#10b981"),
-    ("÷", 580, 380, 28, "#f59e0b"),
-    ("=", 100, 250, 25, "#ec4899"),
-    ("π", 600, 280, 32, "#06b6d4"),
-    ("+", 150, 450, 24, "#a78bfa"),
-    ("√", 620, 200, 26, "#14b8a6"),
-    ("∑", 50, 180, 30, "#f97316"),
-    ("∞", 650, 450, 28, "#84cc16"),
-]
-
-for symbol, x, y, size, color in math_symbols:
-    home_canvas.create_text(x, y, text=symbol, 
-                           font=("Arial", size, "bold"), 
-                           fill=color, 
-                           stipple="gray50")  
-
-# Add math equation decorations
-equations = [
-    ("2+2=4", 70, 420, "#64748b"),
-    ("5×3=15", 600, 50, "#64748b"),
-]
-
-for eq, x, y, color in equations:
-    home_canvas.create_text(x, y, text=eq, 
-                           font=("Arial", 12), 
-                           fill=color,
-                           stipple="gray50")
-
-# Main title
-home_canvas.create_text(350, 100, text="Maths Quiz", 
-                       font=("Arial", 40, "bold"),
-                       fill="#1e3a8a")
-
-# Subtitle
-home_canvas.create_text(350, 160, text="Test Your Arithmetic Skills!", 
-                       font=("Arial", 16),
-                       fill="#1e40af")
-
-# Description
-home_canvas.create_text(350, 195, text="Answer 10 questions and get ranked!", 
-                       font=("Arial", 13),
-                       fill="#475569")
-
-# Start button on canvas
-Button(home_frame, text="Start Quiz", 
-       font=("Arial", 16, "bold"),
-       bg="#10b981", fg="white",
-       width=15, height=2,
-       command=lambda: [displayMenu(), show_frame(task_frame)]).place(x=250, y=240)
-
-# Instructions button
-Button(home_frame, text="Instructions", 
-       font=("Arial", 12),
-       bg="#3b82f6", fg="white",
-       width=12,
-       command=show_instructions).place(x=290, y=330)
 
 # ============================================================================
 # START APPLICATION
 # ============================================================================
 
-show_frame(home_frame)
-root.mainloop()
\ No newline at end of file
+def main():
+    """
+    Runs the quiz in its own window.
+    """
+    sessionrecorder.start_from_environment()
+    window = Tk()
+    window.title("Maths Quiz")
+    window.geometry("700x500")
+    window.resizable(False, False)
+    build_app(window)
+    window.mainloop()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,57 @@
+from array import array
+
+# ============================================================================
+# COMPACT QUESTION STORAGE
+# ============================================================================
+
+class QuestionSet:
+    """
+    A list of quiz questions stored as columns of numbers.
+
+    Each question only keeps its two numbers and its operation ('+' or
+    '-') in compact arrays. The "45 + 9" text and the answer are worked
+    out when a question is looked at, so no string or tuple is kept per
+    question.
+
+    q = QuestionSet()
+    q.add(45, '+', 9)
+    q[0]  ->  ("45 + 9", 54)
+    """
+
+    __slots__ = ("first", "second", "operations")
+
+    def __init__(self):
+        self.first = array("i")
+        self.second = array("i")
+        self.operations = bytearray()
+
+    def add(self, num1, operation, num2):
+        """
+        Adds a question, e.g. add(45, '+', 9).
+        """
+        self.first.append(num1)
+        self.second.append(num2)
+        self.operations.append(ord(operation))
+
+    def __len__(self):
+        return len(self.first)
+
+    def __getitem__(self, index):
+        """
+        Returns (question text, correct answer) for a question.
+        """
+        return self.question(index), self.answer(index)
+
+    def question(self, index):
+        """
+        Returns the question text, e.g. "45 + 9".
+        """
+        return f"{self.first[index]} {chr(self.operations[index])} {self.second[index]}"
+
+    def answer(self, index):
+        """
+        Returns the correct answer to a question.
+        """
+        if self.operations[index] == ord("+"):
+            return self.first[index] + self.second[index]
+        return self.first[index] - self.second[index]
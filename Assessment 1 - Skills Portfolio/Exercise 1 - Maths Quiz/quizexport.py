@@ -0,0 +1,250 @@
+import heapq
+import os
+import tempfile
+
+# Folder this script lives in
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Where the quiz appends one line per finished quiz
+SESSIONS_FILE = os.path.join(script_dir, "quiz_sessions.csv")
+
+# Default marks file used by the Student Manager
+MARKS_FILE = os.path.join(script_dir, "..", "A1 - Resources", "studentMarks.txt")
+
+# Where the per-student quiz results are written for the Student Manager
+# to join to the marks by student code
+QUIZ_RESULTS_FILE = os.path.join(script_dir, "..", "A1 - Resources", "quizResults.txt")
+
+# How many lines are held in memory before a sorted run is spilled to disk
+BATCH_SIZE = 500_000
+
+# ============================================================================
+# RECORDING SESSIONS
+# ============================================================================
+
+def append_session(student_code, difficulty, score, filename=SESSIONS_FILE):
+    """
+    Adds one finished quiz to the sessions file.
+
+    Parameters:
+        student_code: The student's code (1000-9999)
+        difficulty: "Easy", "Moderate" or "Advanced"
+        score: Final score out of 100
+    """
+    with open(filename, "a", encoding="utf-8") as file:
+        file.write(f"{student_code},{difficulty},{score}\n")
+
+
+def read_sessions(filenames):
+    """
+    Yields (student_code, score) for every session in the given files.
+    Lines that can't be read are skipped.
+    """
+    for filename in filenames:
+        with open(filename, "r", encoding="utf-8") as file:
+            for line in file:
+                parts = line.strip().split(",")
+                if len(parts) < 3:
+                    continue
+                try:
+                    yield int(parts[0]), int(parts[2])
+                except ValueError:
+                    continue
+
+
+# ============================================================================
+# SORTED RUNS (EXTERNAL SORT)
+# ============================================================================
+
+def first_field(row):
+    """
+    Sort key for runs: the student code at the start of each row.
+    """
+    return row[0]
+
+
+def write_run(rows, folder):
+    """
+    Sorts rows by their first field and writes them to a spill file in
+    folder. Returns the spill file's path.
+    """
+    rows.sort(key=first_field)
+    handle, path = tempfile.mkstemp(suffix=".run", dir=folder)
+    with os.fdopen(handle, "w", encoding="utf-8") as file:
+        for row in rows:
+            file.write(",".join(str(value) for value in row) + "\n")
+    return path
+
+
+def read_run(path, convert):
+    """
+    Yields rows from a spill file, passing each split line to convert.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            yield convert(line.rstrip("\n").split(","))
+
+
+def _session_totals(fields):
+    """
+    Converts a spilled session totals line back to numbers:
+    (code, best, total, attempts)
+    """
+    return int(fields[0]), int(fields[1]), int(fields[2]), int(fields[3])
+
+
+def _marks_code(fields):
+    """
+    Converts a spilled marks line back to (code,)
+    """
+    return (int(fields[0]),)
+
+
+def spill_sessions(sessions, folder, batch_size=BATCH_SIZE):
+    """
+    Aggregates sessions a batch at a time and spills each batch as a
+    run sorted by student code. Each run line is
+    code,best,total,attempts for the sessions in that batch.
+    Returns the list of run paths.
+    """
+    runs = []
+    batch = {}
+    seen = 0
+    for code, score in sessions:
+        totals = batch.get(code)
+        if totals is None:
+            batch[code] = [score, score, 1]
+        else:
+            if score > totals[0]:
+                totals[0] = score
+            totals[1] += score
+            totals[2] += 1
+
+        seen += 1
+        if seen == batch_size:
+            runs.append(write_run([(code,) + tuple(totals) for code, totals in batch.items()],
+                                  folder))
+            batch = {}
+            seen = 0
+
+    if batch:
+        runs.append(write_run([(code,) + tuple(totals) for code, totals in batch.items()],
+                              folder))
+    return runs
+
+
+def merge_session_runs(runs):
+    """
+    Merges sorted session runs and yields one (code, best, total, attempts)
+    per student, in code order. Only one line per run is in memory.
+    """
+    streams = [read_run(path, _session_totals) for path in runs]
+    current = None
+    for code, best, total, attempts in heapq.merge(*streams, key=first_field):
+        if current is not None and current[0] == code:
+            current[1] = max(current[1], best)
+            current[2] += total
+            current[3] += attempts
+        else:
+            if current is not None:
+                yield tuple(current)
+            current = [code, best, total, attempts]
+    if current is not None:
+        yield tuple(current)
+
+
+def spill_marks(marks_file, folder, batch_size=BATCH_SIZE):
+    """
+    Splits the student codes of a marks file into runs sorted by code.
+    Only the codes are needed to match quiz students, so the names and
+    marks are never spilled. Returns the list of run paths.
+    """
+    runs = []
+    batch = []
+    with open(marks_file, "r", encoding="utf-8") as file:
+        file.readline()  # Skip the student count
+        for line in file:
+            fields = line.strip().split(",")
+            if len(fields) < 6:
+                continue
+            batch.append((int(fields[0]),))
+            if len(batch) == batch_size:
+                runs.append(write_run(batch, folder))
+                batch = []
+    if batch:
+        runs.append(write_run(batch, folder))
+    return runs
+
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+
+def export_quiz_marks(session_files, marks_file=MARKS_FILE, output_file=QUIZ_RESULTS_FILE,
+                      batch_size=BATCH_SIZE):
+    """
+    Writes each student's quiz results to a file the Student Manager
+    joins to the marks by student code (see MarksStore.load_quiz_results).
+    The marks file itself is left unchanged, so it still loads as before.
+
+    Both the sessions and the marks file's student codes are put in code
+    order with an external sort (sorted runs spilled to disk, then
+    merged), then walked side by side in a single pass. Memory use
+    depends on batch_size, not on how many sessions or students there are.
+
+    There is one line per student who has a marks record and has taken
+    a quiz, in code order: code, best score, mean score, attempts, e.g.
+
+        8439,90,72.5,4
+
+    Parameters:
+        session_files: Sessions files written by append_session()
+        marks_file: The studentMarks.txt style file to match students in
+        output_file: Where to write the quiz results
+        batch_size: Lines held in memory before spilling a run
+
+    Returns the number of quiz students that had no marks record.
+    """
+    unmatched = 0
+    with tempfile.TemporaryDirectory() as folder:
+        session_runs = spill_sessions(read_sessions(session_files), folder, batch_size)
+        marks_runs = spill_marks(marks_file, folder, batch_size)
+
+        quiz = merge_session_runs(session_runs)
+        marks = heapq.merge(*[read_run(path, _marks_code) for path in marks_runs],
+                            key=first_field)
+
+        with open(output_file, "w", encoding="utf-8") as file:
+            totals = next(quiz, None)
+            matched = False
+            for row in marks:
+                code = row[0]
+
+                # Move past quiz students that come before this marks record
+                while totals is not None and totals[0] < code:
+                    if not matched:
+                        unmatched += 1
+                    totals = next(quiz, None)
+                    matched = False
+
+                # Duplicate codes in the marks file only get one line
+                if totals is not None and totals[0] == code and not matched:
+                    best, total, attempts = totals[1], totals[2], totals[3]
+                    file.write(f"{code},{best},{total / attempts:.1f},{attempts}\n")
+                    matched = True
+
+            # Anything left over has no marks record
+            while totals is not None:
+                if not matched:
+                    unmatched += 1
+                totals = next(quiz, None)
+                matched = False
+
+    return unmatched
+
+
+if __name__ == "__main__":
+    import sys
+
+    missing = export_quiz_marks(sys.argv[1:] or [SESSIONS_FILE])
+    print(f"Export finished ({missing} quiz students had no marks record)")
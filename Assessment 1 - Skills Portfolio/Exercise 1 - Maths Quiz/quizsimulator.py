@@ -0,0 +1,221 @@
+"""
+Monte Carlo simulator for the Maths Quiz rank bands
+
+Plays millions of synthetic quizzes with the same rules as the app
+(10 questions, 10 points on the first attempt, 5 on the second, 0
+after that, '+' or '-' picked 50/50) and reports how the final scores
+and ranks come out. Use it to check whether the A+/A/B/C bands in
+scoring.py fit real students before changing them.
+
+Accuracy is the chance of answering correctly on one attempt and can be
+set per difficulty and per operation. Work is split into batches run on
+a process pool.
+
+Usage:
+    python quizsimulator.py [sessions] [--config accuracy.json] [--workers N]
+
+Example config:
+    {
+        "accuracy": {"Easy": {"+": 0.95, "-": 0.9}, ...},
+        "second_try_accuracy": {"Easy": {"+": 0.8, "-": 0.75}, ...},
+        "difficulty_mix": {"Easy": 0.5, "Moderate": 0.3, "Advanced": 0.2}
+    }
+"""
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import random
+import time
+
+from scoring import ATTEMPT_POINTS, QUESTIONS_PER_QUIZ, RANK_BANDS, get_rank
+
+DIFFICULTIES = ("Easy", "Moderate", "Advanced")
+OPERATIONS = ("+", "-")
+
+# Chance of a correct answer on one attempt
+DEFAULT_ACCURACY = {
+    "Easy": {"+": 0.95, "-": 0.90},
+    "Moderate": {"+": 0.80, "-": 0.70},
+    "Advanced": {"+": 0.55, "-": 0.45},
+}
+
+# How the simulated sessions are split between difficulties
+DEFAULT_MIX = {"Easy": 0.4, "Moderate": 0.4, "Advanced": 0.2}
+
+# Sessions handed to a worker at a time
+BATCH_SIZE = 1_000_000
+
+# ============================================================================
+# SIMULATION
+# ============================================================================
+
+def question_outcomes(accuracy, second_try_accuracy):
+    """
+    Works out the chance of each points value for one question of a
+    difficulty, with the operation picked 50/50 like decideOperation().
+
+    Parameters:
+        accuracy: {"+": chance, "-": chance} for the first attempt
+        second_try_accuracy: the same for the second attempt
+
+    Returns (points values, weights), e.g. ((10, 5, 0), (0.8, 0.1, 0.1))
+    """
+    first, second = ATTEMPT_POINTS
+    share = 1 / len(OPERATIONS)
+    right_first = 0.0
+    right_second = 0.0
+    for operation in OPERATIONS:
+        right_first += share * accuracy[operation]
+        right_second += share * (1 - accuracy[operation]) * second_try_accuracy[operation]
+    return (first, second, 0), (right_first, right_second, 1 - right_first - right_second)
+
+
+def simulate_batch(job):
+    """
+    Plays a batch of quizzes at one difficulty and returns a Counter of
+    final score -> number of sessions.
+
+    Each question is played separately: the outcome of every question
+    is drawn at random and a session's score is the sum of its 10.
+    """
+    points, weights, sessions, seed = job
+    generator = random.Random(seed)
+    scores = Counter()
+
+    # Draw in chunks so memory stays small for big batches
+    chunk = 100_000
+    remaining = sessions
+    while remaining > 0:
+        count = min(chunk, remaining)
+        answers = generator.choices(points, weights, k=count * QUESTIONS_PER_QUIZ)
+        scores.update(map(sum, zip(*[iter(answers)] * QUESTIONS_PER_QUIZ)))
+        remaining -= count
+    return scores
+
+
+def make_jobs(sessions, accuracy, second_try_accuracy, mix, seed, batch_size=BATCH_SIZE):
+    """
+    Splits the sessions between difficulties (by mix) and into batches.
+    """
+    generator = random.Random(seed)
+    total_weight = sum(mix.values())
+    jobs = []
+    assigned = 0
+    for number, difficulty in enumerate(DIFFICULTIES):
+        if number == len(DIFFICULTIES) - 1:
+            share = sessions - assigned
+        else:
+            share = round(sessions * mix.get(difficulty, 0) / total_weight)
+        assigned += share
+
+        points, weights = question_outcomes(accuracy[difficulty],
+                                            second_try_accuracy[difficulty])
+        while share > 0:
+            count = min(batch_size, share)
+            jobs.append((difficulty, (points, weights, count, generator.getrandbits(64))))
+            share -= count
+    return jobs
+
+
+def simulate(sessions, accuracy=DEFAULT_ACCURACY, second_try_accuracy=None,
+             mix=DEFAULT_MIX, workers=None, seed=None):
+    """
+    Runs the simulation and returns {difficulty: Counter of scores}.
+
+    Parameters:
+        sessions: Total number of quizzes to play
+        accuracy: Chance of a right answer per difficulty and operation
+        second_try_accuracy: Same for second attempts (defaults to accuracy)
+        mix: Share of sessions at each difficulty
+        workers: Worker processes (None for one per core, 1 for no pool)
+        seed: Seed for repeatable runs
+    """
+    if second_try_accuracy is None:
+        second_try_accuracy = accuracy
+    jobs = make_jobs(sessions, accuracy, second_try_accuracy, mix, seed)
+    results = {difficulty: Counter() for difficulty in DIFFICULTIES}
+
+    if workers == 1:
+        for difficulty, job in jobs:
+            results[difficulty].update(simulate_batch(job))
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        outcomes = pool.map(simulate_batch, [job for difficulty, job in jobs])
+        for (difficulty, job), scores in zip(jobs, outcomes):
+            results[difficulty].update(scores)
+    return results
+
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+def rank_shares(scores):
+    """
+    Returns {rank: share of sessions} for a Counter of scores.
+    """
+    total = sum(scores.values())
+    shares = {rank: 0.0 for lowest, rank, message, color in RANK_BANDS}
+    for score, count in scores.items():
+        shares[get_rank(score)[0]] += count / total
+    return shares
+
+
+def print_report(results):
+    """
+    Prints the score distribution and rank shares, per difficulty and overall.
+    """
+    overall = Counter()
+    for scores in results.values():
+        overall.update(scores)
+
+    for name, scores in list(results.items()) + [("All", overall)]:
+        total = sum(scores.values())
+        if total == 0:
+            continue
+        mean = sum(score * count for score, count in scores.items()) / total
+        shares = rank_shares(scores)
+        print(f"\n{name}: {total:,} sessions, mean score {mean:.1f}")
+        print("  ranks: " + "  ".join(f"{rank} {share * 100:5.1f}%"
+                                      for rank, share in shares.items()))
+
+    # Cumulative table to help pick thresholds
+    total = sum(overall.values())
+    print("\nscore  sessions     share   at or above")
+    at_or_above = 0
+    for score in sorted(overall, reverse=True):
+        at_or_above += overall[score]
+        print(f"{score:>5}  {overall[score]:>10,}  {overall[score] / total * 100:6.2f}%"
+              f"   {at_or_above / total * 100:6.2f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate Maths Quiz sessions")
+    parser.add_argument("sessions", type=int, nargs="?", default=10_000_000)
+    parser.add_argument("--config", help="JSON file with accuracy settings")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    options = parser.parse_args()
+
+    accuracy, second_try_accuracy, mix = DEFAULT_ACCURACY, None, DEFAULT_MIX
+    if options.config:
+        with open(options.config, "r", encoding="utf-8") as file:
+            config = json.load(file)
+        accuracy = config.get("accuracy", accuracy)
+        second_try_accuracy = config.get("second_try_accuracy")
+        mix = config.get("difficulty_mix", mix)
+
+    started = time.perf_counter()
+    results = simulate(options.sessions, accuracy, second_try_accuracy, mix,
+                       workers=options.workers, seed=options.seed)
+    elapsed = time.perf_counter() - started
+
+    print_report(results)
+    print(f"\n{options.sessions:,} sessions in {elapsed:.1f}s "
+          f"({options.sessions / elapsed:,.0f} sessions/s)")
+
+
+if __name__ == "__main__":
+    main()
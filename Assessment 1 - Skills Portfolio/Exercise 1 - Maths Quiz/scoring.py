@@ -0,0 +1,38 @@
+# ============================================================================
+# QUIZ SCORING RULES
+# ============================================================================
+# Kept in one place so the quiz and the simulator always use the same rules
+
+QUESTIONS_PER_QUIZ = 10
+
+# Points for a correct answer on each attempt (no points after that)
+ATTEMPT_POINTS = (10, 5)
+
+# Rank bands: (lowest score, rank, message, color), best first
+RANK_BANDS = [
+    (90, "A+", "Outstanding!", "#059669"),
+    (80, "A", "Excellent!", "#0891b2"),
+    (70, "B", "Good job!", "#7c3aed"),
+    (60, "C", "Not bad!", "#ea580c"),
+    (0, "D", "Keep practicing!", "#dc2626"),
+]
+
+
+def points_for_attempt(attempt):
+    """
+    Returns the points for a correct answer on attempt 1, 2, ...
+    """
+    if 1 <= attempt <= len(ATTEMPT_POINTS):
+        return ATTEMPT_POINTS[attempt - 1]
+    return 0
+
+
+def get_rank(score, bands=RANK_BANDS):
+    """
+    Returns (rank, message, color) for a final score out of 100
+    """
+    for lowest, rank, message, color in bands:
+        if score >= lowest:
+            return rank, message, color
+    lowest, rank, message, color = bands[-1]
+    return rank, message, color
@@ -0,0 +1,97 @@
+import random
+
+import adaptive
+
+
+def make_state(plus_rating, minus_rating, plus_answers=0, minus_answers=0):
+    state = adaptive.new_state()
+    state[0], state[1], state[2], state[3] = plus_rating, minus_rating, plus_answers, minus_answers
+    return state
+
+
+def test_update_state_moves_one_rating():
+    right = adaptive.new_state()
+    adaptive.update_state(right, "+", 1, 1)
+    # A new student at 1000 on a 1000 rated question had a 50% chance
+    assert list(right) == [1000 + adaptive.NEW_STUDENT_K_FACTOR // 2, 1000, 1, 0]
+
+    wrong = adaptive.new_state()
+    adaptive.update_state(wrong, "-", 1, 0)
+    assert wrong[0] == 1000 and wrong[1] < 1000 and list(wrong[2:]) == [0, 1]
+
+    half = adaptive.new_state()
+    adaptive.update_state(half, "+", 1, 0.5)
+    assert half[0] == 1000
+
+
+def test_update_state_slows_down_after_new_student_answers():
+    new = make_state(1000, 1000, adaptive.NEW_STUDENT_ANSWERS - 1)
+    settled = make_state(1000, 1000, adaptive.NEW_STUDENT_ANSWERS)
+    adaptive.update_state(new, "+", 1, 1)
+    adaptive.update_state(settled, "+", 1, 1)
+    assert new[0] == 1000 + adaptive.NEW_STUDENT_K_FACTOR // 2
+    assert settled[0] == 1000 + adaptive.K_FACTOR // 2
+
+
+def test_update_state_stays_in_range():
+    low = make_state(300, 1000)
+    for _ in range(200):
+        adaptive.update_state(low, "+", 1, 0)
+        assert low[0] >= 0
+
+    high = make_state(2990, 1000, 32767)
+    adaptive.update_state(high, "+", 1, 1)
+    assert high[0] <= 3000 and high[2] == 32767
+
+
+def test_choose_question_picks_digits_near_target():
+    state = make_state(1600, 1600)
+    digits = {adaptive.choose_question(state, random.Random(seed))[1]
+              for seed in range(50)}
+    # 3 digits (item rating 1400 or 1450) is closest to a 70% chance
+    assert digits == {3}
+    assert adaptive.choose_question(adaptive.new_state(), random.Random(0))[1] == 1
+
+
+def test_choose_question_favours_the_weaker_operation():
+    generator = random.Random(1)
+    even = [adaptive.choose_question(make_state(1000, 1000), generator)[0]
+            for _ in range(4000)]
+    assert 0.45 < even.count("-") / len(even) < 0.55
+
+    weaker_minus = [adaptive.choose_question(make_state(1400, 800), generator)[0]
+                    for _ in range(4000)]
+    share = weaker_minus.count("-") / len(weaker_minus)
+    expected = 1 / (1 + 10 ** (-600 / adaptive.OPERATION_SPREAD))
+    assert abs(share - expected) < 0.03
+    assert "+" in weaker_minus
+
+
+def test_state_slots_round_trip(tmp_path):
+    filename = str(tmp_path / "ratings.bin")
+    assert list(adaptive.load_state(1234, filename)) == list(adaptive.new_state())
+
+    first = make_state(1100, 900, 3, 4)
+    last = make_state(2000, 1500, 40, 50)
+    adaptive.save_state(1005, first, filename)
+    adaptive.save_state(adaptive.LAST_CODE, last, filename)
+    assert (tmp_path / "ratings.bin").stat().st_size == \
+        (adaptive.LAST_CODE - adaptive.FIRST_CODE + 1) * adaptive.RECORD_SIZE
+
+    assert list(adaptive.load_state(1005, filename)) == list(first)
+    assert list(adaptive.load_state(adaptive.LAST_CODE, filename)) == list(last)
+    # Slots in between were never written, so they read as new students
+    assert list(adaptive.load_state(1006, filename)) == list(adaptive.new_state())
+
+    # Rewriting one slot leaves the others alone
+    adaptive.save_state(1005, make_state(1200, 900, 4, 4), filename)
+    assert adaptive.load_state(1005, filename)[0] == 1200
+    assert list(adaptive.load_state(adaptive.LAST_CODE, filename)) == list(last)
+
+
+def test_codes_outside_the_file_are_not_saved(tmp_path):
+    filename = str(tmp_path / "ratings.bin")
+    adaptive.save_state(None, make_state(1500, 1500), filename)
+    adaptive.save_state(123, make_state(1500, 1500), filename)
+    assert not (tmp_path / "ratings.bin").exists()
+    assert list(adaptive.load_state(123, filename)) == list(adaptive.new_state())
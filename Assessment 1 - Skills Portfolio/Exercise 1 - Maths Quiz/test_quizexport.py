@@ -0,0 +1,32 @@
+import random
+
+from quizexport import append_session, export_quiz_marks
+
+
+def test_export_matches_simple_aggregation(tmp_path):
+    generator = random.Random(4)
+    marks_codes = generator.sample(range(1000, 1200), 60)
+    marks_codes.append(marks_codes[0])  # Duplicate codes only get one line
+    marks_file = tmp_path / "marks.txt"
+    with open(marks_file, "w", encoding="utf-8") as file:
+        file.write(f"{len(marks_codes)}\n")
+        for code in marks_codes:
+            file.write(f"{code},Student {code},1,2,3,4\n")
+
+    # Sessions spread over two files, some for students with no marks record
+    sessions = {}
+    session_files = [str(tmp_path / "a.csv"), str(tmp_path / "b.csv")]
+    for _ in range(500):
+        code = generator.randint(1000, 1250)
+        score = generator.randrange(0, 101, 5)
+        append_session(code, "Easy", score, generator.choice(session_files))
+        sessions.setdefault(code, []).append(score)
+
+    output = tmp_path / "quizResults.txt"
+    # A tiny batch size forces many spilled runs to be merged
+    unmatched = export_quiz_marks(session_files, str(marks_file), str(output), batch_size=7)
+
+    expected = [f"{code},{max(scores)},{sum(scores) / len(scores):.1f},{len(scores)}"
+                for code, scores in sorted(sessions.items()) if code in marks_codes]
+    assert output.read_text(encoding="utf-8").splitlines() == expected
+    assert unmatched == len([code for code in sessions if code not in marks_codes])
@@ -0,0 +1,65 @@
+import re
+
+from worksheets import QUESTIONS_PER_PAGE, export_worksheets
+
+
+def read_pdf_text(path):
+    """
+    Checks a PDF's cross-reference table and returns the text lines of
+    its pages in order.
+    """
+    data = path.read_bytes()
+    xref = int(re.search(rb"startxref\n(\d+)\n%%EOF", data).group(1))
+    assert data[xref:xref + 4] == b"xref"
+
+    header, *entries = data[xref:].split(b"trailer")[0].splitlines()[1:]
+    count = int(header.split()[1])
+    assert len(entries) == count
+    for number, entry in enumerate(entries[1:], start=1):
+        offset = int(entry.split()[0])
+        assert data[offset:].startswith(f"{number} 0 obj".encode())
+
+    kids = re.search(rb"/Kids \[([^\]]*)\] /Count (\d+)", data)
+    pages = [int(number) for number in kids.group(1).split()[::3]]
+    assert len(pages) == int(kids.group(2))
+
+    texts = []
+    for page in pages:
+        stream = re.search(rf"\n{page + 1} 0 obj\n<< /Length (\d+) >>\nstream\n".encode(), data)
+        length = int(stream.group(1))
+        content = data[stream.end():stream.end() + length].decode("latin-1")
+        texts.append(re.findall(r"\((.*?)\) Tj", content))
+    return texts
+
+
+def test_pdf_worksheet_and_answers_match(tmp_path):
+    export_worksheets("Moderate", 5, str(tmp_path), files=2, output_format="pdf", workers=1)
+
+    total_pages = 0
+    for number in (1, 2):
+        worksheet = read_pdf_text(tmp_path / f"worksheet_{number:03d}.pdf")
+        answers = read_pdf_text(tmp_path / f"answers_{number:03d}.pdf")
+        assert len(worksheet) == len(answers)
+        total_pages += len(worksheet)
+
+        for worksheet_page, answers_page in zip(worksheet, answers):
+            questions = [line for line in worksheet_page if "________" in line]
+            solved = [line for line in answers_page if re.match(r"\d+\.", line)]
+            assert len(questions) == len(solved) == QUESTIONS_PER_PAGE
+            for question, answer in zip(questions, solved):
+                expression, result = answer.split(".", 1)[1].rsplit("=", 1)
+                assert question.startswith(answer.split("=")[0])
+                assert eval(expression) == int(result)
+    assert total_pages == 5
+
+
+def test_html_answers_are_correct(tmp_path):
+    export_worksheets("Easy", 3, str(tmp_path), output_format="html", workers=1)
+    worksheet = (tmp_path / "worksheet_001.html").read_text(encoding="utf-8")
+    answers = (tmp_path / "answers_001.html").read_text(encoding="utf-8")
+
+    questions = re.findall(r"<li>(.*?) = ________</li>", worksheet)
+    solved = re.findall(r"<li>(.*?) = <b>(-?\d+)</b></li>", answers)
+    assert len(questions) == 3 * QUESTIONS_PER_PAGE
+    assert questions == [question for question, result in solved]
+    assert all(eval(question) == int(result) for question, result in solved)
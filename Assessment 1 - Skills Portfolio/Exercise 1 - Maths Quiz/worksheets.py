@@ -0,0 +1,255 @@
+"""
+Printable worksheet export for the Maths Quiz
+
+Makes worksheets and matching answer keys from the same question
+generator as the quiz (randomInt and decideOperation), as HTML or PDF.
+Questions are generated, laid out and written one page at a time, so
+memory stays flat however many pages are made. Large exports can be
+split over several files written in parallel.
+
+Usage:
+    python worksheets.py [--difficulty Easy] [--pages 10] [--files 1]
+                         [--format html|pdf] [--output worksheets]
+"""
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import argparse
+import html
+import os
+import random
+
+from mathsquiz import decideOperation, randomInt
+
+QUESTIONS_PER_PAGE = 20
+
+# ============================================================================
+# QUESTION PIPELINE
+# ============================================================================
+
+def generate_questions(difficulty):
+    """
+    Endless generator of (question text, answer) using the quiz's
+    randomInt and decideOperation.
+    """
+    while True:
+        num1, num2 = randomInt(difficulty)
+        operation = decideOperation()
+        answer = num1 + num2 if operation == "+" else num1 - num2
+        yield f"{num1} {operation} {num2}", answer
+
+
+def paginate(questions, pages, per_page=QUESTIONS_PER_PAGE):
+    """
+    Groups questions into pages, yielding one list per page.
+    Only the current page is ever held in memory.
+    """
+    for _ in range(pages):
+        yield list(islice(questions, per_page))
+
+
+# ============================================================================
+# HTML
+# ============================================================================
+
+HTML_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: Arial, sans-serif; }}
+.page {{ page-break-after: always; padding: 20px; }}
+h1 {{ font-size: 20px; }}
+ol {{ columns: 2; font-size: 18px; line-height: 2.2; }}
+</style>
+</head>
+<body>
+"""
+
+
+def write_html(pages, worksheet_path, answers_path, title):
+    """
+    Writes the worksheet and answer key side by side, one page at a time.
+    """
+    with open(worksheet_path, "w", encoding="utf-8") as worksheet, \
+         open(answers_path, "w", encoding="utf-8") as answers:
+        worksheet.write(HTML_HEAD.format(title=html.escape(title)))
+        answers.write(HTML_HEAD.format(title=html.escape(title + " - Answers")))
+
+        for number, page in enumerate(pages, start=1):
+            heading = f"<div class=\"page\">\n<h1>{html.escape(title)} - Page {number}</h1>\n<ol>\n"
+            worksheet.write(heading)
+            answers.write(heading.replace("</h1>", " (Answers)</h1>"))
+            for question, answer in page:
+                worksheet.write(f"<li>{question} = ________</li>\n")
+                answers.write(f"<li>{question} = <b>{answer}</b></li>\n")
+            worksheet.write("</ol>\n</div>\n")
+            answers.write("</ol>\n</div>\n")
+
+        worksheet.write("</body>\n</html>\n")
+        answers.write("</body>\n</html>\n")
+
+
+# ============================================================================
+# PDF
+# ============================================================================
+
+class PdfWriter:
+    """
+    Writes a simple text-only PDF page by page.
+
+    Object numbers are fixed in advance (catalog 1, page tree 2, font 3,
+    then a page object and a content object for each page), so pages can
+    be written as they come and the page tree is written at the end
+    without keeping the pages in memory. Only the byte offset of each
+    object is remembered, for the cross-reference table.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "wb")
+        self.offsets = array("Q")
+        self.page_count = 0
+        self.file.write(b"%PDF-1.4\n")
+
+        self._object(1, "<< /Type /Catalog /Pages 2 0 R >>")
+        self.offsets.append(0)  # Page tree (object 2) is written at the end
+        self._object(3, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    def _object(self, number, body):
+        """
+        Writes one object, remembering where it starts.
+        """
+        if number <= len(self.offsets):
+            self.offsets[number - 1] = self.file.tell()
+        else:
+            self.offsets.append(self.file.tell())
+        self.file.write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+
+    def add_page(self, lines):
+        """
+        Adds an A4 page with one line of text per item in lines
+        (room for about 22 lines).
+        """
+        page_number = 4 + self.page_count * 2
+        text = ["BT", "/F1 14 Tf", "60 780 Td", "17 TL"]
+        for line in lines:
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            text.append(f"({escaped}) Tj T*")
+            text.append("T*")  # Blank line between questions
+        text.append("ET")
+        stream = "\n".join(text)
+
+        self._object(page_number,
+                     f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                     f"/Resources << /Font << /F1 3 0 R >> >> "
+                     f"/Contents {page_number + 1} 0 R >>")
+        self._object(page_number + 1,
+                     f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        self.page_count += 1
+
+    def close(self):
+        """
+        Writes the page tree, cross-reference table and trailer.
+        """
+        self.offsets[1] = self.file.tell()
+        self.file.write(b"2 0 obj\n<< /Type /Pages /Kids [")
+        for page in range(self.page_count):
+            self.file.write(f"{4 + page * 2} 0 R ".encode("latin-1"))
+        self.file.write(f"] /Count {self.page_count} >>\nendobj\n".encode("latin-1"))
+
+        xref = self.file.tell()
+        self.file.write(f"xref\n0 {len(self.offsets) + 1}\n0000000000 65535 f \n".encode("latin-1"))
+        for offset in self.offsets:
+            self.file.write(f"{offset:010d} 00000 n \n".encode("latin-1"))
+        self.file.write(f"trailer\n<< /Size {len(self.offsets) + 1} /Root 1 0 R >>\n"
+                        f"startxref\n{xref}\n%%EOF\n".encode("latin-1"))
+        self.file.close()
+
+
+def write_pdf(pages, worksheet_path, answers_path, title):
+    """
+    Writes the worksheet and answer key PDFs, one page at a time.
+    """
+    worksheet = PdfWriter(worksheet_path)
+    answers = PdfWriter(answers_path)
+    for number, page in enumerate(pages, start=1):
+        worksheet.add_page([f"{title} - Page {number}", ""] +
+                           [f"{index}.   {question} = ________"
+                            for index, (question, answer) in enumerate(page, start=1)])
+        answers.add_page([f"{title} - Page {number} (Answers)", ""] +
+                         [f"{index}.   {question} = {answer}"
+                          for index, (question, answer) in enumerate(page, start=1)])
+    worksheet.close()
+    answers.close()
+
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+
+WRITERS = {"html": write_html, "pdf": write_pdf}
+
+
+def export_file(job):
+    """
+    Writes one worksheet file and its answer key. Run in a worker process.
+    """
+    difficulty, pages, output_format, folder, file_number, seed = job
+
+    # Each worker gets its own seed so files don't repeat each other
+    random.seed(seed)
+
+    title = f"{difficulty} Maths Worksheet {file_number}"
+    worksheet_path = os.path.join(folder, f"worksheet_{file_number:03d}.{output_format}")
+    answers_path = os.path.join(folder, f"answers_{file_number:03d}.{output_format}")
+    WRITERS[output_format](paginate(generate_questions(difficulty), pages),
+                           worksheet_path, answers_path, title)
+    return worksheet_path, answers_path
+
+
+def export_worksheets(difficulty, pages, folder, files=1, output_format="html", workers=None):
+    """
+    Exports pages of worksheets split over several files, written in
+    parallel. Returns the list of (worksheet, answer key) paths.
+
+    Parameters:
+        difficulty: "Easy", "Moderate" or "Advanced"
+        pages: Total number of worksheet pages
+        folder: Where to write the files
+        files: How many worksheet files to split the pages over
+        output_format: "html" or "pdf"
+        workers: Worker processes (None for one per core, 1 for no pool)
+    """
+    os.makedirs(folder, exist_ok=True)
+    seeds = random.Random()
+    jobs = []
+    for file_number in range(1, files + 1):
+        file_pages = pages // files + (1 if file_number <= pages % files else 0)
+        jobs.append((difficulty, file_pages, output_format, folder, file_number,
+                     seeds.getrandbits(64)))
+
+    if workers == 1 or files == 1:
+        return [export_file(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(export_file, jobs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export printable maths worksheets")
+    parser.add_argument("--difficulty", default="Easy", choices=["Easy", "Moderate", "Advanced"])
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--files", type=int, default=1)
+    parser.add_argument("--format", dest="output_format", default="html", choices=sorted(WRITERS))
+    parser.add_argument("--output", default="worksheets")
+    parser.add_argument("--workers", type=int, default=None)
+    options = parser.parse_args()
+
+    for worksheet_path, answers_path in export_worksheets(
+            options.difficulty, options.pages, options.output, options.files,
+            options.output_format, options.workers):
+        print(f"Wrote {worksheet_path} and {answers_path}")
+
+
+if __name__ == "__main__":
+    main()
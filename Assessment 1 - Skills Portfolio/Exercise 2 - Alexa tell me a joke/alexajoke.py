@@ -4,8 +4,8 @@ import random
 import os
 import sys
 
-# Change working directory to where this script is located
-# This ensures the jokes file and images folder are found correctly
+# Folder this script is located in
+# The jokes file and images folder are loaded from here
 if getattr(sys, 'frozen', False):
     # If running as compiled exe
     script_dir = os.path.dirname(sys.executable)
@@ -13,31 +13,41 @@ else:
     # If running as Python script
     script_dir = os.path.dirname(os.path.abspath(__file__))
 
-os.chdir(script_dir)
-print(f"Working directory: {script_dir}")
-
-# Try to import PIL for background images (To confirm)
-try:
-    from PIL import Image, ImageTk
-    PIL_AVAILABLE = True
-    print("✓ PIL available")
-except:
-    PIL_AVAILABLE = False
-    print("✗ PIL not available")
-
-# Create main window
-root = Tk()
-root.title("🎭 Alexa Joke Assistant 🎭")
-root.geometry("800x600")
-root.resizable(False, False)
-root.config(bg="#fef3c7")
-
-# Store image references to prevent garbage collection
-image_references = {}
+# The shared image cache is in the folder above the exercises
+portfolio_dir = os.path.dirname(script_dir)
+if portfolio_dir not in sys.path:
+    sys.path.append(portfolio_dir)
+import assetcache
+import sessionrecorder
+import alexaspeech
+from jokelist import JokeList
+from jokecorpus import JokeCorpus, MANIFEST_NAME
+
+# Size background images are scaled to
+WINDOW_SIZE = (800, 600)
+
+# Sharded joke corpus, used instead of randomJokes.txt when it exists
+# (see jokecorpus.py), and the memory its open shards may use
+CORPUS_DIR = os.path.join(script_dir, "jokes")
+CORPUS_MEMORY_BUDGET = 32 * 1024 * 1024
+
+# Main window, created by build_app()
+root = None
+
+# What the Quit button does after confirming (root.quit by default)
+exit_command = None
+
+# Frames and widgets used by the joke functions, created by build_app()
+home_frame = None
+joke_frame = None
+setup_label = None
+punchline_label = None
+punchline_button = None
 
 # Global variables
-jokes_list = []  # Will store all jokes as (setup, punchline) 
+jokes_list = JokeList()  # Will store all jokes as (setup, punchline)
 current_joke = None  # Current joke being displayed
+upcoming_joke = None  # Joke the next click will show, picked early so its speech is ready
 punchline_shown = False  # Track if punchline is visible
 
 # ============================================================================
@@ -48,13 +58,21 @@ def load_jokes():
     """
     Loads all jokes from the randomJokes.txt file.
     Each joke is on a new line with setup and punchline separated by '?'
-    Stores jokes as tuples: (setup, punchline)
+    Stores jokes in a compact JokeList, each one read back as (setup, punchline)
+    
+    If a sharded corpus is in the 'jokes' folder it is used instead.
+    Only its manifest is read here; shards are opened when a joke from
+    them is picked.
     """
     global jokes_list
     
     try:
+        if os.path.exists(os.path.join(CORPUS_DIR, MANIFEST_NAME)):
+            jokes_list = JokeCorpus(CORPUS_DIR, CORPUS_MEMORY_BUDGET)
+            return
+        
         # Try to open the jokes file
-        with open("randomJokes.txt", "r", encoding="utf-8") as file:
+        with open(os.path.join(script_dir, "randomJokes.txt"), "r", encoding="utf-8") as file:
             lines = file.readlines()
             
             # Process each line
@@ -68,7 +86,7 @@ def load_jokes():
                     punchline = parts[1].strip()  # Get punchline
                     
                     # Add to jokes list
-                    jokes_list.append((setup, punchline))
+                    jokes_list.add(setup, punchline)
             
     except FileNotFoundError:
         # If file not found, show error
@@ -82,45 +100,42 @@ def load_jokes():
 # LOAD BACKGROUND IMAGES
 # ============================================================================
 
+def image_path(image_name):
+    """
+    Returns the full path of an image in the 'images' folder.
+    """
+    return os.path.join(script_dir, "images", image_name)
+
+
 def load_background_image(frame, image_name, fallback_color):
     """
     Loads the background image if available.
     Falls back to colored background if image not found.
     
+    The colored background is shown straight away and the image is
+    loaded from the shared asset cache on a background thread, so the
+    screen never waits for it.
+    
     Parameters:
         frame: The frame to add background to
         image_name: Name of the image file in 'images' folder
         fallback_color: Color to use if image not found
     """
-    if PIL_AVAILABLE:
-        try:
-            # Try to load background image from images folder
-            image_path = f"images/{image_name}"
-            print(f"Trying to load: {image_path}")
-            
-            img = Image.open(image_path)
-            img = img.resize((800, 600))
-            photo = ImageTk.PhotoImage(img)
-            
-            # Store reference
-            image_references[image_name] = photo
-            
-            # Create label with background image
-            bg_label = Label(frame, image=photo)
-            bg_label.place(x=0, y=0, relwidth=1, relheight=1)
-            
+    frame.config(bg=fallback_color)
+    
+    # Label that will hold the image, created first so it stays at the back
+    bg_label = Label(frame, bg=fallback_color, bd=0)
+    bg_label.place(x=0, y=0, relwidth=1, relheight=1)
+    
+    def show_image(photo):
+        if photo is None:
+            print(f"✗ Failed to load {image_name}, using color")
+        elif bg_label.winfo_exists():
+            bg_label.config(image=photo)
             print(f"✓ Loaded: {image_name}")
-            return True
-        except Exception as e:
-            # Image not found, use colored background
-            print(f"✗ Failed to load {image_name}: {e}")
-            frame.config(bg=fallback_color)
-            return False
-    else:
-        # PIL not available, use colored background
-        print(f"Using color for {image_name} (PIL not available)")
-        frame.config(bg=fallback_color)
-        return False
+    
+    assetcache.load_photo_async(frame, image_path(image_name),
+                                WINDOW_SIZE, show_image)
 
 
 # ============================================================================
@@ -145,25 +160,50 @@ def start_joke_app():
 # JOKE DISPLAY FUNCTIONS
 # ============================================================================
 
+def pick_joke():
+    """
+    Makes the next random joke the current one and picks the one after
+    it (the upcoming joke is picked early so its speech can be ready).
+    Returns the current joke as (setup, punchline).
+    Raises OSError or ValueError if a corpus shard can't be read.
+    """
+    global current_joke, upcoming_joke, punchline_shown
+    
+    if upcoming_joke is None:
+        upcoming_joke = random.choice(jokes_list)
+    current_joke = upcoming_joke
+    upcoming_joke = random.choice(jokes_list)
+    punchline_shown = False
+    return current_joke
+
+
 def get_random_joke():
     """
     Selects a random joke from the jokes list.
-    Displays only the setup (question part).
+    Displays only the setup (question part) and reads it aloud.
     """
-    global current_joke, punchline_shown
-    
     # Check if jokes are loaded
     if not jokes_list:
         messagebox.showwarning("No Jokes", "No jokes available!")
         return
     
-    # Get a random joke
-    current_joke = random.choice(jokes_list)
-    punchline_shown = False
+    # Get a random joke (already picked last time, if there was one)
+    try:
+        pick_joke()
+    except (OSError, ValueError) as e:
+        # A shard of a sharded corpus couldn't be read
+        messagebox.showerror("Error", f"Error loading jokes: {e}")
+        return
     
-    # Display the setup
+    # Display and say the setup
     setup_text = current_joke[0]
     setup_label.config(text=setup_text, fg="#1e40af")
+    alexaspeech.speak(setup_label, setup_text)
+    
+    # Render the punchline and the next joke's setup in the background
+    # so they can be played straight away
+    alexaspeech.prepare(setup_label, current_joke[1])
+    alexaspeech.prepare(setup_label, upcoming_joke[0])
     
     # Clear punchline
     punchline_label.config(text="")
@@ -172,9 +212,17 @@ def get_random_joke():
     punchline_button.config(state=NORMAL, bg="#f59e0b")
 
 
+def tell_joke():
+    """
+    Handles the "Alexa tell me a Joke" button.
+    """
+    sessionrecorder.record("joke")
+    get_random_joke()
+
+
 def show_punchline():
     """
-    Displays the punchline of the current joke.
+    Displays the punchline of the current joke and reads it aloud.
     """
     global punchline_shown
     
@@ -188,9 +236,12 @@ def show_punchline():
         messagebox.showinfo("Already Shown", "Punchline is already visible!")
         return
     
+    sessionrecorder.record("punchline")
+    
     # Display the punchline
     punchline_text = current_joke[1]
     punchline_label.config(text=punchline_text, fg="#059669")
+    alexaspeech.speak(punchline_label, punchline_text)
     punchline_shown = True
     
     # Disable button after showing punchline
@@ -202,6 +253,7 @@ def next_joke():
     Gets a new random joke.
     Same as get_random_joke but with different name for clarity.
     """
+    sessionrecorder.record("next")
     get_random_joke()
 
 
@@ -211,7 +263,7 @@ def quit_app():
     """
     response = messagebox.askyesno("Quit", "Are you sure you want to quit?")
     if response:
-        root.quit()
+        exit_command()
 
 
 def go_home():
@@ -222,6 +274,7 @@ def go_home():
     global current_joke, punchline_shown
     current_joke = None
     punchline_shown = False
+    alexaspeech.stop()
     setup_label.config(text="Click the button below to hear a joke!")
     punchline_label.config(text="")
     punchline_button.config(state=DISABLED, bg="#94a3b8")
@@ -231,242 +284,290 @@ def go_home():
 
 
 # ============================================================================
-# CREATE FRAMES
+# BUILD THE APP
 # ============================================================================
 
-# Home frame (welcome screen)
-home_frame = Frame(root)
-home_frame.place(relwidth=1, relheight=1)
+def build_app(parent, on_exit=None):
+    """
+    Creates the home and joke screens inside parent and loads the jokes.
+    Used by main() with its own window and by the launcher with a
+    shared one.
+    
+    Parameters:
+        parent: Window or frame to build the app in (800x600)
+        on_exit: What Quit does after confirming (defaults to closing the window)
+    """
+    global root, exit_command, home_frame, joke_frame
+    global setup_label, punchline_label, punchline_button
+    
+    root = parent.winfo_toplevel()
+    exit_command = on_exit or root.quit
+    
+    # ---- Create frames ----
 
-# Joke frame (main application)
-joke_frame = Frame(root)
-joke_frame.place(relwidth=1, relheight=1)
+    # Home frame (welcome screen)
+    home_frame = Frame(parent)
+    home_frame.place(relwidth=1, relheight=1)
 
-# ============================================================================
-# HOME SCREEN DESIGN
-# ============================================================================
+    # Joke frame (main application)
+    joke_frame = Frame(parent)
+    joke_frame.place(relwidth=1, relheight=1)
 
-# Create canvas first
-home_canvas = Canvas(home_frame, width=800, height=600, bg="#fef3c7", highlightthickness=0)
-home_canvas.pack(fill=BOTH, expand=True)
+    # ---- Home screen design ----
 
-# Load home background ON THE CANVAS
-if PIL_AVAILABLE:
-    try:
-        img = Image.open("images/home_background.jpeg")
-        img = img.resize((800, 600))
-        photo = ImageTk.PhotoImage(img)
-        image_references['home_canvas_bg'] = photo
-        home_canvas.create_image(0, 0, image=photo, anchor=NW)
-        print("✓ Home background loaded on canvas")
-    except Exception as e:
-        print(f"✗ Home background failed: {e}")
-
-# Main title
-home_canvas.create_text(400, 150, 
-                       text="Let's Laugh Together!", 
-                       font=("Arial", 42, "bold"),
-                       fill="#7c2d12",
-                       anchor=CENTER)
-
-# Subtitle
-home_canvas.create_text(400, 210, 
-                       text="🎭 Your Personal Comedy Assistant 🎭", 
-                       font=("Arial", 18),
-                       fill="#92400e",
-                       anchor=CENTER)
-
-# Description
-home_canvas.create_text(400, 270, 
-                       text="Get ready for some hilarious jokes!", 
-                       font=("Arial", 15),
-                       fill="#78350f",
-                       anchor=CENTER)
-
-# Big laugh emoji
-home_canvas.create_text(400, 350, 
-                       text="🤣", 
-                       font=("Arial", 80),
-                       anchor=CENTER)
-
-# Start button on home screen
-start_button = Button(
-    home_frame,
-    text="🚀 Start Laughing",
-    font=("Arial", 18, "bold"),
-    fg="white",
-    bg="#f59e0b",
-    activebackground="#d97706",
-    width=18,
-    height=2,
-    borderwidth=0,
-    cursor="hand2",
-    command=start_joke_app
-)
-start_button.place(x=270, y=480)
+    # Create canvas first
+    home_canvas = Canvas(home_frame, width=800, height=600, bg="#fef3c7", highlightthickness=0)
+    home_canvas.pack(fill=BOTH, expand=True)
 
-# ============================================================================
-# JOKE SCREEN DESIGN
-# ============================================================================
+    # Load home background ON THE CANVAS (behind the text)
+    def show_home_image(photo):
+        if photo is None:
+            print("✗ Home background failed")
+            return
+        item = home_canvas.create_image(0, 0, image=photo, anchor=NW)
+        home_canvas.tag_lower(item)
+        print("✓ Home background loaded on canvas")
+    
+    assetcache.load_photo_async(home_canvas, image_path("home_background.jpeg"),
+                                WINDOW_SIZE, show_home_image)
+
+    # Main title
+    home_canvas.create_text(400, 150, 
+                           text="Let's Laugh Together!", 
+                           font=("Arial", 42, "bold"),
+                           fill="#7c2d12",
+                           anchor=CENTER)
+
+    # Subtitle
+    home_canvas.create_text(400, 210, 
+                           text="🎭 Your Personal Comedy Assistant 🎭", 
+                           font=("Arial", 18),
+                           fill="#92400e",
+                           anchor=CENTER)
+
+    # Description
+    home_canvas.create_text(400, 270, 
+                           text="Get ready for some hilarious jokes!", 
+                           font=("Arial", 15),
+                           fill="#78350f",
+                           anchor=CENTER)
+
+    # Big laugh emoji
+    home_canvas.create_text(400, 350, 
+                           text="🤣", 
+                           font=("Arial", 80),
+                           anchor=CENTER)
+
+    # Start button on home screen
+    start_button = Button(
+        home_frame,
+        text="🚀 Start Laughing",
+        font=("Arial", 18, "bold"),
+        fg="white",
+        bg="#f59e0b",
+        activebackground="#d97706",
+        width=18,
+        height=2,
+        borderwidth=0,
+        cursor="hand2",
+        command=start_joke_app
+    )
+    start_button.place(x=270, y=480)
+
+    # Exit button on home screen (back to the launcher when opened from there)
+    exit_button = Button(
+        home_frame,
+        text="🚪 Exit",
+        font=("Arial", 12, "bold"),
+        fg="white",
+        bg="#ef4444",
+        activebackground="#dc2626",
+        width=10,
+        borderwidth=0,
+        cursor="hand2",
+        command=exit_command
+    )
+    exit_button.place(x=670, y=20)
+
+    # ---- Joke screen design ----
+
+    # Load joke screen background
+    load_background_image(joke_frame, "joke_background.jpeg", "#f0f9ff")
+
+    # Header frame
+    header_frame = Frame(joke_frame, bg="#1e3a8a", height=100)
+    header_frame.pack(fill=X)
+    header_frame.pack_propagate(False)
+
+    # Title
+    title_label = Label(
+        header_frame,
+        text="🎭 Alexa Joke Assistant 🎭",
+        font=("Arial", 28, "bold"),
+        fg="white",
+        bg="#1e3a8a"
+    )
+    title_label.pack(pady=25)
+
+    # Joke display container
+    joke_container = Frame(joke_frame, bg="white", relief=RAISED, bd=3)
+    joke_container.pack(pady=30, padx=40, fill=BOTH, expand=True)
+
+    # Joke icon
+    joke_icon = Label(
+        joke_container,
+        text="😂",
+        font=("Arial", 50),
+        bg="white"
+    )
+    joke_icon.pack(pady=20)
+
+    # Setup label (question part)
+    setup_label = Label(
+        joke_container,
+        text="Click the button below to hear a joke!",
+        font=("Arial", 18, "bold"),
+        fg="#64748b",
+        bg="white",
+        wraplength=700,
+        justify=CENTER
+    )
+    setup_label.pack(pady=20)
+
+    # Punchline label (answer part)
+    punchline_label = Label(
+        joke_container,
+        text="",
+        font=("Arial", 16, "bold"),
+        fg="#059669",
+        bg="white",
+        wraplength=700,
+        justify=CENTER
+    )
+    punchline_label.pack(pady=10)
+
+    # Buttons container
+    buttons_frame = Frame(joke_frame, bg="#f0f9ff")
+    buttons_frame.pack(pady=20)
+
+    # "Alexa tell me a Joke" button
+    alexa_button = Button(
+        buttons_frame,
+        text="🎤 Alexa tell me a Joke",
+        font=("Arial", 14, "bold"),
+        fg="white",
+        bg="#3b82f6",
+        activebackground="#2563eb",
+        width=20,
+        height=2,
+        borderwidth=0,
+        cursor="hand2",
+        command=tell_joke
+    )
+    alexa_button.grid(row=0, column=0, padx=10, pady=5)
+
+    # "Show Punchline" button
+    punchline_button = Button(
+        buttons_frame,
+        text="😆 Show Punchline",
+        font=("Arial", 14, "bold"),
+        fg="white",
+        bg="#f59e0b",
+        activebackground="#d97706",
+        width=20,
+        height=2,
+        borderwidth=0,
+        cursor="hand2",
+        state=DISABLED,
+        command=show_punchline
+    )
+    punchline_button.grid(row=0, column=1, padx=10, pady=5)
+
+    # "Next Joke" button
+    next_button = Button(
+        buttons_frame,
+        text="➡️ Next Joke",
+        font=("Arial", 14, "bold"),
+        fg="white",
+        bg="#10b981",
+        activebackground="#059669",
+        width=20,
+        height=2,
+        borderwidth=0,
+        cursor="hand2",
+        command=next_joke
+    )
+    next_button.grid(row=1, column=0, padx=10, pady=5)
+
+    # "Home" button
+    home_button = Button(
+        buttons_frame,
+        text="🏠 Home",
+        font=("Arial", 14, "bold"),
+        fg="white",
+        bg="#8b5cf6",
+        activebackground="#7c3aed",
+        width=20,
+        height=2,
+        borderwidth=0,
+        cursor="hand2",
+        command=go_home
+    )
+    home_button.grid(row=1, column=1, padx=10, pady=5)
+
+    # "Quit" button at bottom
+    quit_button = Button(
+        joke_frame,
+        text="🚪 Quit",
+        font=("Arial", 12, "bold"),
+        fg="white",
+        bg="#ef4444",
+        activebackground="#dc2626",
+        width=15,
+        borderwidth=0,
+        cursor="hand2",
+        command=quit_app
+    )
+    quit_button.pack(side=BOTTOM, pady=15)
+
+    # Footer tip
+    footer_label = Label(
+        joke_frame,
+        text="💡 Tip: Click 'Alexa tell me a Joke' to start, then 'Show Punchline' to reveal the answer!",
+        font=("Arial", 10),
+        fg="#64748b",
+        bg="#f0f9ff"
+    )
+    footer_label.pack(side=BOTTOM, pady=5)
+    
+    # Load jokes when application starts
+    load_jokes()
+    
+    # Show home frame first
+    show_frame(home_frame)
 
-# Load joke screen background
-load_background_image(joke_frame, "joke_background.jpeg", "#f0f9ff")
-
-# Header frame
-header_frame = Frame(joke_frame, bg="#1e3a8a", height=100)
-header_frame.pack(fill=X)
-header_frame.pack_propagate(False)
-
-# Title
-title_label = Label(
-    header_frame,
-    text="🎭 Alexa Joke Assistant 🎭",
-    font=("Arial", 28, "bold"),
-    fg="white",
-    bg="#1e3a8a"
-)
-title_label.pack(pady=25)
-
-# Joke display container
-joke_container = Frame(joke_frame, bg="white", relief=RAISED, bd=3)
-joke_container.pack(pady=30, padx=40, fill=BOTH, expand=True)
-
-# Joke icon
-joke_icon = Label(
-    joke_container,
-    text="😂",
-    font=("Arial", 50),
-    bg="white"
-)
-joke_icon.pack(pady=20)
-
-# Setup label (question part)
-setup_label = Label(
-    joke_container,
-    text="Click the button below to hear a joke!",
-    font=("Arial", 18, "bold"),
-    fg="#64748b",
-    bg="white",
-    wraplength=700,
-    justify=CENTER
-)
-setup_label.pack(pady=20)
-
-# Punchline label (answer part)
-punchline_label = Label(
-    joke_container,
-    text="",
-    font=("Arial", 16, "bold"),
-    fg="#059669",
-    bg="white",
-    wraplength=700,
-    justify=CENTER
-)
-punchline_label.pack(pady=10)
-
-# Buttons container
-buttons_frame = Frame(joke_frame, bg="#f0f9ff")
-buttons_frame.pack(pady=20)
-
-# "Alexa tell me a Joke" button
-alexa_button = Button(
-    buttons_frame,
-    text="🎤 Alexa tell me a Joke",
-    font=("Arial", 14, "bold"),
-    fg="white",
-    bg="#3b82f6",
-    activebackground="#2563eb",
-    width=20,
-    height=2,
-    borderwidth=0,
-    cursor="hand2",
-    command=get_random_joke
-)
-alexa_button.grid(row=0, column=0, padx=10, pady=5)
-
-# "Show Punchline" button
-punchline_button = Button(
-    buttons_frame,
-    text="😆 Show Punchline",
-    font=("Arial", 14, "bold"),
-    fg="white",
-    bg="#f59e0b",
-    activebackground="#d97706",
-    width=20,
-    height=2,
-    borderwidth=0,
-    cursor="hand2",
-    state=DISABLED,
-    command=show_punchline
-)
-punchline_button.grid(row=0, column=1, padx=10, pady=5)
-
-# "Next Joke" button
-next_button = Button(
-    buttons_frame,
-    text="➡️ Next Joke",
-    font=("Arial", 14, "bold"),
-    fg="white",
-    bg="#10b981",
-    activebackground="#059669",
-    width=20,
-    height=2,
-    borderwidth=0,
-    cursor="hand2",
-    command=next_joke
-)
-next_button.grid(row=1, column=0, padx=10, pady=5)
-
-# "Home" button
-home_button = Button(
-    buttons_frame,
-    text="🏠 Home",
-    font=("Arial", 14, "bold"),
-    fg="white",
-    bg="#8b5cf6",
-    activebackground="#7c3aed",
-    width=20,
-    height=2,
-    borderwidth=0,
-    cursor="hand2",
-    command=go_home
-)
-home_button.grid(row=1, column=1, padx=10, pady=5)
-
-# "Quit" button at bottom
-quit_button = Button(
-    joke_frame,
-    text="🚪 Quit",
-    font=("Arial", 12, "bold"),
-    fg="white",
-    bg="#ef4444",
-    activebackground="#dc2626",
-    width=15,
-    borderwidth=0,
-    cursor="hand2",
-    command=quit_app
-)
-quit_button.pack(side=BOTTOM, pady=15)
-
-# Footer tip
-footer_label = Label(
-    joke_frame,
-    text="💡 Tip: Click 'Alexa tell me a Joke' to start, then 'Show Punchline' to reveal the answer!",
-    font=("Arial", 10),
-    fg="#64748b",
-    bg="#f0f9ff"
-)
-footer_label.pack(side=BOTTOM, pady=5)
 
 # ============================================================================
 # INITIALIZE APPLICATION
 # ============================================================================
 
-# Load jokes when application starts
-load_jokes()
+def main():
+    """
+    Runs the joke assistant in its own window.
+    """
+    sessionrecorder.start_from_environment()
+    window = Tk()
+    window.title("🎭 Alexa Joke Assistant 🎭")
+    window.geometry("800x600")
+    window.resizable(False, False)
+    window.config(bg="#fef3c7")
+    print(f"Script directory: {script_dir}")
+    
+    build_app(window)
+    
+    # Start the application
+    window.mainloop()
 
-# Show home frame first
-show_frame(home_frame)
 
-# Start the application
-root.mainloop()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,368 @@
+"""
+Offline speech for the Joke Assistant, so "Alexa" reads jokes aloud
+
+Text is turned into WAV files by a backend on a worker thread, and the
+files are kept in a size-limited cache keyed by a hash of the text, so
+a joke heard before plays at once. Nothing here blocks the Tk loop:
+speak() plays a cached clip straight away, or queues it and plays it
+when the worker has rendered it.
+
+Backends (picked with the ALEXA_VOICE environment variable, or "auto"):
+    pyttsx3  uses the system's offline voices (if pyttsx3 is installed)
+    espeak   uses the espeak-ng or espeak program
+    silent   makes short silent clips and plays nothing (for tests)
+"""
+import hashlib
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import wave
+
+# Folder this script is located in
+if getattr(sys, 'frozen', False):
+    script_dir = os.path.dirname(sys.executable)
+else:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Rendered clips are kept here between launches
+CACHE_DIR = os.path.join(script_dir, ".speech_cache")
+
+# Oldest clips are deleted when the cache gets bigger than this
+CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+# How often (ms) the Tk loop checks for clips finished on the worker thread
+POLL_MS = 15
+
+# ============================================================================
+# BACKENDS
+# ============================================================================
+
+class SilentBackend:
+    """
+    Makes a short silent clip for any text and plays nothing.
+    """
+
+    name = "silent"
+
+    def render(self, text, path):
+        with wave.open(path, "wb") as clip:
+            clip.setnchannels(1)
+            clip.setsampwidth(2)
+            clip.setframerate(8000)
+            clip.writeframes(bytes(1600))  # 0.1 seconds
+
+    def play(self, path):
+        pass
+
+    def stop(self):
+        pass
+
+
+class SoundPlayer:
+    """
+    Plays WAV files without waiting for them to finish.
+    """
+
+    def __init__(self):
+        self.process = None
+
+    def play(self, path):
+        self.stop()
+        if sys.platform == "win32":
+            import winsound
+            winsound.PlaySound(path, winsound.SND_FILENAME | winsound.SND_ASYNC)
+            return
+
+        player = shutil.which("afplay") or shutil.which("paplay") or shutil.which("aplay")
+        if player is not None:
+            self.process = subprocess.Popen([player, path],
+                                            stdout=subprocess.DEVNULL,
+                                            stderr=subprocess.DEVNULL)
+
+    def stop(self):
+        if sys.platform == "win32":
+            import winsound
+            winsound.PlaySound(None, 0)
+        elif self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+        self.process = None
+
+
+class EspeakBackend(SoundPlayer):
+    """
+    Renders speech with the espeak-ng (or espeak) program.
+    """
+
+    name = "espeak"
+
+    def __init__(self, program):
+        super().__init__()
+        self.program = program
+
+    def render(self, text, path):
+        # "--" so text starting with '-' isn't read as an option
+        subprocess.run([self.program, "-w", path, "--", text], check=True, timeout=60,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+class Pyttsx3Backend(SoundPlayer):
+    """
+    Renders speech with pyttsx3 (SAPI5 on Windows, NSSpeech on macOS,
+    espeak on Linux). The engine is made on the worker thread the first
+    time it is needed.
+    """
+
+    name = "pyttsx3"
+
+    def __init__(self):
+        super().__init__()
+        self.engine = None
+
+    def render(self, text, path):
+        if self.engine is None:
+            import pyttsx3
+            self.engine = pyttsx3.init()
+        self.engine.save_to_file(text, path)
+        self.engine.runAndWait()
+
+
+def choose_backend(name=None):
+    """
+    Returns the backend called name ("pyttsx3", "espeak", "silent"), or
+    the best one installed for "auto". Falls back to silent.
+    """
+    name = name or os.environ.get("ALEXA_VOICE", "auto")
+
+    if name in ("auto", "pyttsx3"):
+        try:
+            import pyttsx3
+            return Pyttsx3Backend()
+        except ImportError:
+            pass
+    if name in ("auto", "espeak"):
+        program = shutil.which("espeak-ng") or shutil.which("espeak")
+        if program is not None:
+            return EspeakBackend(program)
+    return SilentBackend()
+
+
+# Backend in use, chosen the first time something is spoken
+backend = None
+
+# Bytes of clips in the cache. Counted once on the first render and then
+# kept up to date, so the folder is only scanned again to trim it
+cache_bytes = None
+
+# Set once a rendering error has been printed, so a broken backend
+# doesn't print for every joke
+render_error_shown = False
+
+# ============================================================================
+# DISK CACHE
+# ============================================================================
+
+def cache_path(text):
+    """
+    Returns the cache file for text spoken by the current backend.
+    """
+    digest = hashlib.sha1(f"{backend.name}\n{text}".encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, f"{digest}.wav")
+
+
+def trim_cache(max_bytes=CACHE_MAX_BYTES):
+    """
+    Deletes the least recently used clips until the cache fits in max_bytes
+    and sets cache_bytes to what is left.
+    """
+    global cache_bytes
+    clips = []
+    try:
+        for entry in os.scandir(CACHE_DIR):
+            if entry.name.endswith(".wav") and ".tmp" not in entry.name:
+                info = entry.stat()
+                clips.append((info.st_mtime, info.st_size, entry.path))
+    except OSError:
+        cache_bytes = 0
+        return
+
+    total = sum(size for mtime, size, path in clips)
+    for mtime, size, path in sorted(clips):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+    cache_bytes = total
+
+
+def render(text):
+    """
+    Returns the path of a clip of text, rendering it on a cache miss.
+    Runs on the worker thread. Returns None if rendering failed.
+    """
+    global render_error_shown, cache_bytes
+    path = cache_path(text)
+    if os.path.exists(path):
+        # Mark the clip as recently used so trimming keeps it
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    temporary = None
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+
+        # Write to a temporary file first so a half written clip is never
+        # played (mkstemp gives a name no other thread or process is using)
+        handle, temporary = tempfile.mkstemp(suffix=".tmp.wav", dir=CACHE_DIR)
+        os.close(handle)
+        backend.render(text, temporary)
+        os.replace(temporary, path)
+    except Exception as e:
+        if temporary is not None and os.path.exists(temporary):
+            os.remove(temporary)
+        if not render_error_shown:
+            render_error_shown = True
+            print(f"✗ Speech with {backend.name} failed, jokes won't be read aloud: {e}")
+        return None
+
+    if cache_bytes is None:
+        trim_cache(CACHE_MAX_BYTES)  # First clip this run, count what is there
+    else:
+        try:
+            cache_bytes += os.path.getsize(path)
+        except OSError:
+            pass
+        if cache_bytes > CACHE_MAX_BYTES:
+            trim_cache(CACHE_MAX_BYTES)
+    return path
+
+
+# ============================================================================
+# SPEAKING FROM TK
+# ============================================================================
+
+# Background worker state
+_jobs = queue.Queue()
+_results = queue.Queue()
+_worker = None
+_polling = False
+
+# Text that should be played when its clip is ready (only the latest
+# speak() request is played, older ones are just cached)
+_wanted = None
+
+
+def speak(widget, text):
+    """
+    Says text without blocking the Tk loop. A cached clip plays at once,
+    otherwise it plays as soon as the worker has rendered it.
+
+    Parameters:
+        widget: Any widget of the window (used to check for finished clips)
+        text: What to say
+    """
+    global _wanted
+    _start()
+
+    path = cache_path(text)
+    if os.path.exists(path):
+        _wanted = None
+        backend.play(path)
+        return
+
+    _wanted = text
+    _queue(widget, text)
+
+
+def prepare(widget, text):
+    """
+    Renders text in the background so a later speak() plays at once.
+    """
+    _start()
+    if not os.path.exists(cache_path(text)):
+        _queue(widget, text)
+
+
+def stop():
+    """
+    Stops anything being said and forgets waiting speak() requests.
+    """
+    global _wanted
+    _wanted = None
+    if backend is not None:
+        backend.stop()
+
+
+def _start():
+    """
+    Picks the backend and starts the worker the first time speech is used.
+    """
+    global backend, _worker
+    if backend is None:
+        backend = choose_backend()
+    if _worker is None:
+        _worker = threading.Thread(target=_work, daemon=True)
+        _worker.start()
+
+
+def _queue(widget, text):
+    """
+    Hands text to the worker and makes sure the Tk loop checks for it.
+    """
+    global _polling
+    _jobs.put(text)
+    if not _polling:
+        _polling = True
+        root = widget.winfo_toplevel()
+        root.after(POLL_MS, _poll, root)
+
+
+def _work():
+    """
+    Worker thread: renders queued texts one after another.
+    """
+    # pyttsx3 uses SAPI5 through COM on Windows, which has to be set up
+    # on each thread that uses it
+    if sys.platform == "win32":
+        try:
+            import comtypes
+            comtypes.CoInitialize()
+        except ImportError:
+            pass
+
+    while True:
+        text = _jobs.get()
+        _results.put((text, render(text)))
+        _jobs.task_done()
+
+
+def _poll(root):
+    """
+    Runs on the Tk thread: plays the clip that was asked for once it is
+    ready.
+    """
+    global _polling, _wanted
+
+    while True:
+        try:
+            text, path = _results.get_nowait()
+        except queue.Empty:
+            break
+        if text == _wanted:
+            _wanted = None
+            if path is not None:
+                backend.play(path)
+
+    if _jobs.unfinished_tasks or not _results.empty():
+        root.after(POLL_MS, _poll, root)
+    else:
+        _polling = False
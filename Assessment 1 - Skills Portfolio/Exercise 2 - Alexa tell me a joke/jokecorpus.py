@@ -0,0 +1,325 @@
+"""
+Joke corpora split into category shards
+
+A corpus is a folder of shard files plus a small manifest. Each shard
+holds jokes of one category in the same "setup?punchline" line format
+as randomJokes.txt, and big categories are split over several shards.
+The manifest lists every shard with its category and joke count:
+
+    puns,puns_000.txt,50000
+    puns,puns_001.txt,12345
+    animals,animals_000.txt,8000
+
+Only the manifest is read at startup. A shard is opened the first time
+one of its jokes is picked: small shards are read into a JokeList, big
+ones are memory-mapped with an index of where each line starts. When
+the open shards use more than the memory budget, the least recently
+used ones are closed.
+
+To build a corpus:
+    python jokecorpus.py jokes puns=puns.txt animals=animals.txt [--shard-size 50000]
+"""
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+import argparse
+import mmap
+import os
+
+from jokelist import JokeList
+
+MANIFEST_NAME = "manifest.txt"
+
+# Most jokes written to one shard file by build_corpus()
+SHARD_SIZE = 50_000
+
+# Shards smaller than this are read into memory, bigger ones are mapped
+MAP_THRESHOLD = 1024 * 1024
+
+# Default memory allowed for open shards
+DEFAULT_MEMORY_BUDGET = 32 * 1024 * 1024
+
+# ============================================================================
+# SHARDS
+# ============================================================================
+
+def split_joke(line):
+    """
+    Splits a "setup?punchline" line like load_jokes() does.
+    Returns (setup, punchline), or None if the line isn't a joke.
+    """
+    line = line.strip()
+    if not line or "?" not in line:
+        return None
+    setup, punchline = line.split("?", 1)
+    return setup.strip() + "?", punchline.strip()
+
+
+class MappedShard:
+    """
+    A shard file read through a memory map. Only the start of each joke
+    line is kept in memory; the text stays in the file (and the OS page
+    cache) until a joke is picked.
+
+    Lines that aren't jokes (blank, or with no '?') are skipped, the
+    same as LoadedShard, so both count a shard the same way.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        # starts[i] is where joke i's line begins
+        self.starts = array("Q")
+        position = 0
+        for line in iter(self.map.readline, b""):
+            # split_joke() accepts exactly the lines with a '?' in them
+            if b"?" in line:
+                self.starts.append(position)
+            position += len(line)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        start = self.starts[index]
+        end = self.map.find(b"\n", start)
+        if end == -1:
+            end = len(self.map)
+        return split_joke(self.map[start:end].decode("utf-8"))
+
+    def memory_size(self):
+        """
+        Bytes this shard keeps in memory (the line index).
+        """
+        return self.starts.itemsize * len(self.starts)
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+
+class LoadedShard(JokeList):
+    """
+    A small shard read fully into a JokeList.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, path):
+        super().__init__()
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                joke = split_joke(line)
+                if joke is not None:
+                    self.add(*joke)
+
+    def memory_size(self):
+        """
+        Bytes this shard keeps in memory (text plus the two index arrays).
+        """
+        return (len(self.blob) + self.starts.itemsize * len(self.starts)
+                + self.setup_lengths.itemsize * len(self.setup_lengths))
+
+    def close(self):
+        pass
+
+
+def open_shard(path):
+    """
+    Opens a shard, mapping it if it is big.
+    """
+    if os.path.getsize(path) >= MAP_THRESHOLD:
+        return MappedShard(path)
+    return LoadedShard(path)
+
+
+# ============================================================================
+# CORPUS
+# ============================================================================
+
+class JokeCorpus:
+    """
+    All the jokes in a sharded corpus, used like one long list.
+
+    len() comes from the manifest and corpus[i] finds the shard holding
+    joke i, so random.choice(corpus) picks every joke with the same
+    chance: a shard is chosen in proportion to its size and then a joke
+    within it.
+    """
+
+    def __init__(self, folder, memory_budget=DEFAULT_MEMORY_BUDGET, categories=None):
+        """
+        Parameters:
+            folder: Folder with the manifest and shard files
+            memory_budget: Bytes allowed for open shards (the shard in
+                           use is always kept open, even if it is bigger)
+            categories: Only use shards of these categories (None for all)
+        """
+        self.folder = folder
+        self.memory_budget = memory_budget
+
+        # Shard file names and the running joke count at the end of each
+        self.filenames = []
+        self.shard_categories = []
+        self.ends = array("Q")
+        total = 0
+
+        with open(os.path.join(folder, MANIFEST_NAME), "r", encoding="utf-8") as file:
+            for line in file:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                category, filename, count = line.split(",")
+                if categories is not None and category not in categories:
+                    continue
+                if os.path.basename(filename) != filename:
+                    raise ValueError(f"Shard {filename} must be in the corpus folder")
+                if int(count) == 0:
+                    continue
+                total += int(count)
+                self.filenames.append(filename)
+                self.shard_categories.append(category)
+                self.ends.append(total)
+
+        # Open shards, least recently used first: number -> shard
+        self.open_shards = OrderedDict()
+        self.memory_used = 0
+
+    def __len__(self):
+        return self.ends[-1] if self.ends else 0
+
+    def __getitem__(self, index):
+        """
+        Returns joke number index as (setup, punchline).
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("joke index out of range")
+
+        number = bisect_right(self.ends, index)
+        first = self.ends[number - 1] if number else 0
+        return self.shard(number)[index - first]
+
+    def categories(self):
+        """
+        Returns the categories in the corpus.
+        """
+        return sorted(set(self.shard_categories))
+
+    def shard(self, number):
+        """
+        Returns an open shard, opening it (and closing old ones) if needed.
+        """
+        shard = self.open_shards.get(number)
+        if shard is not None:
+            self.open_shards.move_to_end(number)
+            return shard
+
+        shard = open_shard(os.path.join(self.folder, self.filenames[number]))
+        first = self.ends[number - 1] if number else 0
+        if len(shard) != self.ends[number] - first:
+            shard.close()
+            raise ValueError(f"{self.filenames[number]} doesn't match the manifest")
+
+        self.open_shards[number] = shard
+        self.memory_used += shard.memory_size()
+        self.evict()
+        return shard
+
+    def evict(self):
+        """
+        Closes the least recently used shards until the open ones fit in
+        the memory budget. The newest shard is never closed.
+        """
+        while self.memory_used > self.memory_budget and len(self.open_shards) > 1:
+            number, shard = self.open_shards.popitem(last=False)
+            self.memory_used -= shard.memory_size()
+            shard.close()
+
+    def close(self):
+        """
+        Closes every open shard.
+        """
+        for shard in self.open_shards.values():
+            shard.close()
+        self.open_shards.clear()
+        self.memory_used = 0
+
+
+# ============================================================================
+# BUILDING A CORPUS
+# ============================================================================
+
+def build_corpus(sources, folder, shard_size=SHARD_SIZE):
+    """
+    Writes a corpus from joke files, reading them one line at a time.
+    Returns the number of jokes written.
+
+    Parameters:
+        sources: {category: [joke files]} in the randomJokes.txt format
+        folder: Where to write the shards and manifest
+        shard_size: Most jokes per shard file
+    """
+    os.makedirs(folder, exist_ok=True)
+    manifest = []
+    total = 0
+
+    for category, filenames in sources.items():
+        category = category.replace(",", " ").strip()
+        shard = None
+        shard_number = 0
+        count = 0
+
+        for filename in filenames:
+            with open(filename, "r", encoding="utf-8") as source:
+                for line in source:
+                    joke = split_joke(line)
+                    if joke is None:
+                        continue
+
+                    # Start a new shard when the current one is full
+                    if shard is None or count == shard_size:
+                        if shard is not None:
+                            shard.close()
+                            manifest.append((category, shard_name, count))
+                        shard_name = f"{category.replace(' ', '_')}_{shard_number:03d}.txt"
+                        shard_number += 1
+                        shard = open(os.path.join(folder, shard_name), "w", encoding="utf-8")
+                        count = 0
+
+                    shard.write(f"{joke[0]}{joke[1]}\n")
+                    count += 1
+                    total += 1
+
+        if shard is not None:
+            shard.close()
+            manifest.append((category, shard_name, count))
+
+    # The manifest is written last so a half built corpus is never used
+    with open(os.path.join(folder, MANIFEST_NAME), "w", encoding="utf-8") as file:
+        file.write("# category,file,count\n")
+        for category, shard_name, count in manifest:
+            file.write(f"{category},{shard_name},{count}\n")
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a sharded joke corpus")
+    parser.add_argument("folder", help="where to write the corpus")
+    parser.add_argument("sources", nargs="+", help="category=jokes_file")
+    parser.add_argument("--shard-size", type=int, default=SHARD_SIZE)
+    options = parser.parse_args()
+
+    sources = {}
+    for source in options.sources:
+        category, filename = source.split("=", 1)
+        sources.setdefault(category, []).append(filename)
+
+    total = build_corpus(sources, options.folder, options.shard_size)
+    print(f"Wrote {total} jokes to {options.folder}")
+
+
+if __name__ == "__main__":
+    main()
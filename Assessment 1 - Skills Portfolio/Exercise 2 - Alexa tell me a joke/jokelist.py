@@ -0,0 +1,49 @@
+from array import array
+
+# ============================================================================
+# COMPACT JOKE STORAGE
+# ============================================================================
+
+class JokeList:
+    """
+    Holds every joke in one UTF-8 byte string instead of a tuple of two
+    strings per joke.
+
+    For each joke the text "setup?punchline" is added to the end of the
+    blob, and two numbers are kept: where the joke starts and how long
+    its setup (with the '?') is. A joke is only turned back into
+    strings when it is picked, so random.choice() and len() work as
+    they did with the old list of tuples.
+    """
+
+    __slots__ = ("blob", "starts", "setup_lengths")
+
+    def __init__(self):
+        self.blob = bytearray()
+        self.starts = array("Q", [0])
+        self.setup_lengths = array("L")
+
+    def add(self, setup, punchline):
+        """
+        Adds a joke. The setup should already end with '?'.
+        """
+        setup_bytes = setup.encode("utf-8")
+        self.blob += setup_bytes
+        self.blob += punchline.encode("utf-8")
+        self.setup_lengths.append(len(setup_bytes))
+        self.starts.append(len(self.blob))
+
+    def __len__(self):
+        return len(self.setup_lengths)
+
+    def __getitem__(self, index):
+        """
+        Returns the joke as a (setup, punchline) tuple.
+        """
+        if index < 0:
+            index += len(self)
+        start = self.starts[index]
+        middle = start + self.setup_lengths[index]
+        end = self.starts[index + 1]
+        return (self.blob[start:middle].decode("utf-8"),
+                self.blob[middle:end].decode("utf-8"))
@@ -0,0 +1,130 @@
+import os
+import queue
+
+import pytest
+
+import alexaspeech
+
+
+class RecordingBackend(alexaspeech.SilentBackend):
+    """
+    The silent backend, remembering what it was asked to render and play.
+    """
+
+    def __init__(self):
+        self.rendered = []
+        self.played = []
+
+    def render(self, text, path):
+        self.rendered.append(text)
+        super().render(text, path)
+
+    def play(self, path):
+        self.played.append(path)
+
+
+class FakeRoot:
+    """
+    Stands in for the Tk window: after() calls are kept and run by hand.
+    """
+
+    def __init__(self):
+        self.pending = []
+
+    def winfo_toplevel(self):
+        return self
+
+    def after(self, delay, function, *args):
+        self.pending.append((function, args))
+
+    def run_pending(self):
+        while self.pending:
+            function, args = self.pending.pop(0)
+            function(*args)
+
+
+@pytest.fixture
+def speech(tmp_path, monkeypatch):
+    monkeypatch.setenv("ALEXA_VOICE", "silent")
+    assert isinstance(alexaspeech.choose_backend(), alexaspeech.SilentBackend)
+
+    monkeypatch.setattr(alexaspeech, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(alexaspeech, "backend", RecordingBackend())
+    monkeypatch.setattr(alexaspeech, "cache_bytes", None)
+    monkeypatch.setattr(alexaspeech, "_wanted", None)
+    monkeypatch.setattr(alexaspeech, "_polling", False)
+    monkeypatch.setattr(alexaspeech, "_results", queue.Queue())
+    return alexaspeech.backend
+
+
+def test_render_miss_then_hit(speech):
+    path = alexaspeech.render("Why did the chicken cross the road?")
+    assert path is not None and os.path.exists(path)
+    assert speech.rendered == ["Why did the chicken cross the road?"]
+
+    assert alexaspeech.render("Why did the chicken cross the road?") == path
+    assert speech.rendered == ["Why did the chicken cross the road?"]
+    assert alexaspeech.cache_bytes == os.path.getsize(path)
+
+
+def test_trim_cache_removes_least_recently_used(speech, monkeypatch):
+    first = alexaspeech.render("first")
+    second = alexaspeech.render("second")
+    clip_size = os.path.getsize(first)
+    os.utime(first, (100, 100))
+    os.utime(second, (200, 200))
+
+    # Hearing the first clip again makes the second the oldest
+    alexaspeech.render("first")
+
+    monkeypatch.setattr(alexaspeech, "CACHE_MAX_BYTES", 2 * clip_size)
+    third = alexaspeech.render("third")
+    assert os.path.exists(first) and os.path.exists(third)
+    assert not os.path.exists(second)
+    assert alexaspeech.cache_bytes == 2 * clip_size
+
+
+def test_cache_is_only_scanned_to_trim(speech, monkeypatch):
+    scans = []
+    trim_cache = alexaspeech.trim_cache
+    monkeypatch.setattr(alexaspeech, "trim_cache",
+                        lambda max_bytes: scans.append(max_bytes) or trim_cache(max_bytes))
+
+    for number in range(10):
+        alexaspeech.render(f"joke {number}")
+    assert len(scans) == 1  # Just the first render, to count the folder
+
+    clip_size = os.path.getsize(alexaspeech.cache_path("joke 0"))
+    assert alexaspeech.cache_bytes == 10 * clip_size
+    monkeypatch.setattr(alexaspeech, "CACHE_MAX_BYTES", 10 * clip_size)
+    alexaspeech.render("one too many")
+    assert len(scans) == 2
+    assert alexaspeech.cache_bytes == 10 * clip_size
+
+
+def test_speak_plays_only_the_latest_request(speech):
+    root = FakeRoot()
+    alexaspeech.speak(root, "old joke")
+    alexaspeech.speak(root, "new joke")
+    alexaspeech._jobs.join()
+    root.run_pending()
+
+    # Both were rendered for the cache but only the latest was played
+    assert speech.rendered == ["old joke", "new joke"]
+    assert speech.played == [alexaspeech.cache_path("new joke")]
+
+    # A cached clip plays straight away without the worker
+    alexaspeech.speak(root, "old joke")
+    assert speech.played[-1] == alexaspeech.cache_path("old joke")
+    assert root.pending == []
+
+
+def test_stop_forgets_waiting_request(speech):
+    root = FakeRoot()
+    alexaspeech.speak(root, "never heard")
+    alexaspeech.stop()
+    alexaspeech._jobs.join()
+    root.run_pending()
+
+    assert speech.rendered == ["never heard"]
+    assert speech.played == []
@@ -0,0 +1,62 @@
+import jokecorpus
+from jokecorpus import JokeCorpus, build_corpus
+
+
+def make_corpus(tmp_path, shard_size=40):
+    """
+    Builds a corpus with two categories and returns the jokes in order.
+    """
+    puns = tmp_path / "puns.txt"
+    animals = tmp_path / "animals.txt"
+    puns.write_text("".join(f"Pun {i}?Answer {i}\n\n" for i in range(100)), encoding="utf-8")
+    animals.write_text("not a joke\n" + "".join(f"Animal {i}?Moo {i}\n" for i in range(30)),
+                       encoding="utf-8")
+    total = build_corpus({"puns": [str(puns)], "animals": [str(animals)]},
+                         str(tmp_path / "corpus"), shard_size)
+    assert total == 130
+
+    return ([(f"Pun {i}?", f"Answer {i}") for i in range(100)] +
+            [(f"Animal {i}?", f"Moo {i}") for i in range(30)])
+
+
+def test_corpus_indexes_every_joke(tmp_path):
+    expected = make_corpus(tmp_path)
+    corpus = JokeCorpus(str(tmp_path / "corpus"))
+    assert len(corpus) == len(expected)
+    assert [corpus[index] for index in range(len(corpus))] == expected
+    assert corpus[-1] == expected[-1]
+    assert corpus.categories() == ["animals", "puns"]
+    assert len(JokeCorpus(str(tmp_path / "corpus"), categories={"animals"})) == 30
+
+
+def test_mapped_and_loaded_shards_agree(tmp_path, monkeypatch):
+    shard = tmp_path / "shard.txt"
+    shard.write_text("Why?Because\n\nno question mark\r\nWhat? Then ? more\nlast?end",
+                     encoding="utf-8")
+
+    loaded = jokecorpus.LoadedShard(str(shard))
+    mapped = jokecorpus.MappedShard(str(shard))
+    assert len(mapped) == len(loaded) == 3
+    assert [mapped[index] for index in range(3)] == [loaded[index] for index in range(3)]
+    mapped.close()
+
+    # The same corpus read through memory maps gives the same jokes
+    expected = make_corpus(tmp_path)
+    monkeypatch.setattr(jokecorpus, "MAP_THRESHOLD", 0)
+    corpus = JokeCorpus(str(tmp_path / "corpus"))
+    assert [corpus[index] for index in range(len(corpus))] == expected
+    assert all(isinstance(open_shard, jokecorpus.MappedShard)
+               for open_shard in corpus.open_shards.values())
+
+
+def test_cold_shards_are_evicted(tmp_path):
+    make_corpus(tmp_path, shard_size=10)
+    corpus = JokeCorpus(str(tmp_path / "corpus"), memory_budget=300)
+    for index in range(0, len(corpus), 10):
+        corpus[index]
+        assert corpus.memory_used == sum(shard.memory_size()
+                                         for shard in corpus.open_shards.values())
+        assert corpus.memory_used <= 300 or len(corpus.open_shards) == 1
+
+    # The shard used last is the one kept
+    assert list(corpus.open_shards)[-1] == len(corpus.filenames) - 1
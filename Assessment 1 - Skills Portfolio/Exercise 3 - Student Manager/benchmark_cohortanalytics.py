@@ -0,0 +1,76 @@
+"""
+Benchmark for cohortanalytics.py
+
+Writes a set of random class files to a temporary folder, then analyses
+them with 1, 2, 4 ... up to one worker per core and prints the speedup
+over a single worker. Every run is checked against the single worker
+result to make sure merging the partial results is exact.
+
+Usage: python benchmark_cohortanalytics.py [files] [students_per_file]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from cohortanalytics import analyse_files
+
+
+def write_class_file(filename, students):
+    """
+    Writes a random marks file in the studentMarks.txt format.
+    """
+    with open(filename, "w", encoding="utf-8") as file:
+        file.write(f"{students}\n")
+        for _ in range(students):
+            file.write(f"{random.randint(1000, 9999)},Student Name,"
+                       f"{random.randint(0, 20)},{random.randint(0, 20)},"
+                       f"{random.randint(0, 20)},{random.randint(0, 100)}\n")
+
+
+def worker_counts():
+    """
+    Returns 1, 2, 4 ... up to the number of cores.
+    """
+    cores = os.cpu_count() or 1
+    counts = []
+    workers = 1
+    while workers < cores:
+        counts.append(workers)
+        workers *= 2
+    counts.append(cores)
+    return counts
+
+
+def main():
+    file_count = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    students = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+
+    with tempfile.TemporaryDirectory() as folder:
+        print(f"Writing {file_count} files of {students} students...")
+        filenames = []
+        for number in range(file_count):
+            filename = os.path.join(folder, f"class{number}.txt")
+            write_class_file(filename, students)
+            filenames.append(filename)
+
+        baseline_time = None
+        baseline = None
+        for workers in worker_counts():
+            started = time.perf_counter()
+            stats = analyse_files(filenames, workers=workers)
+            elapsed = time.perf_counter() - started
+
+            if baseline is None:
+                baseline, baseline_time = stats, elapsed
+            elif vars(stats) != vars(baseline):
+                print(f"MISMATCH with {workers} workers")
+
+            print(f"{workers:>3} workers: {elapsed:7.2f}s  "
+                  f"speedup {baseline_time / elapsed:5.2f}x  "
+                  f"({stats.count / elapsed:,.0f} students/s)")
+
+
+if __name__ == "__main__":
+    main()
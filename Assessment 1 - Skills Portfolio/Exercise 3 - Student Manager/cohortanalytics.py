@@ -0,0 +1,215 @@
+from concurrent.futures import ProcessPoolExecutor
+import math
+import os
+
+from marksengine import calculate_grade, calculate_percentage, parse_record
+
+# Files bigger than this are split into byte ranges so one huge class
+# file can still be spread over several workers
+CHUNK_SIZE = 16 * 1024 * 1024
+
+# Overall totals are whole numbers from 0 to 160, so one bin per mark
+# gives an exact histogram (and exact percentiles)
+TOTAL_BINS = 161
+
+GRADES = ("A", "B", "C", "D", "F")
+
+# ============================================================================
+# PARTIAL RESULTS
+# ============================================================================
+
+class CohortStats:
+    """
+    Running totals for a group of students.
+
+    Everything kept here is a count or a sum of whole numbers, so two
+    CohortStats can be merged by adding their fields together and the
+    result is exactly the same as if every record had been read by one
+    process.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.sum_coursework = 0
+        self.sum_exam = 0
+        self.sum_coursework_sq = 0
+        self.sum_exam_sq = 0
+        self.sum_coursework_exam = 0
+        self.total_histogram = [0] * TOTAL_BINS
+
+    def add(self, coursework, exam):
+        """
+        Adds one student's coursework total and exam mark.
+        """
+        self.count += 1
+        self.sum_coursework += coursework
+        self.sum_exam += exam
+        self.sum_coursework_sq += coursework * coursework
+        self.sum_exam_sq += exam * exam
+        self.sum_coursework_exam += coursework * exam
+        self.total_histogram[coursework + exam] += 1
+
+    def merge(self, other):
+        """
+        Adds the totals from another CohortStats into this one.
+        """
+        self.count += other.count
+        self.sum_coursework += other.sum_coursework
+        self.sum_exam += other.sum_exam
+        self.sum_coursework_sq += other.sum_coursework_sq
+        self.sum_exam_sq += other.sum_exam_sq
+        self.sum_coursework_exam += other.sum_coursework_exam
+        for total, amount in enumerate(other.total_histogram):
+            self.total_histogram[total] += amount
+        return self
+
+    def grade_distribution(self):
+        """
+        Returns how many students got each grade. Worked out from the
+        histogram, since every total maps to exactly one grade.
+        """
+        counts = dict.fromkeys(GRADES, 0)
+        for total, amount in enumerate(self.total_histogram):
+            if amount:
+                counts[calculate_grade(calculate_percentage(total, 0))] += amount
+        return counts
+
+    def average_percentage(self):
+        """
+        Returns the class average overall percentage.
+        """
+        if self.count == 0:
+            return 0.0
+        return calculate_percentage(self.sum_coursework, self.sum_exam) / self.count
+
+    def percentile(self, fraction):
+        """
+        Returns the overall percentage at a percentile, e.g. 0.9 for the
+        90th percentile (nearest rank method).
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for total, amount in enumerate(self.total_histogram):
+            seen += amount
+            if seen >= rank:
+                return calculate_percentage(total, 0)
+        return 100.0
+
+    def percentile_bands(self, fractions=(0.1, 0.25, 0.5, 0.75, 0.9)):
+        """
+        Returns a dict of percentile -> overall percentage.
+        """
+        return {fraction: self.percentile(fraction) for fraction in fractions}
+
+    def correlation(self):
+        """
+        Returns the Pearson correlation between the coursework total and
+        the exam mark, or 0.0 if either has no spread.
+        """
+        n = self.count
+        covariance = n * self.sum_coursework_exam - self.sum_coursework * self.sum_exam
+        spread_coursework = n * self.sum_coursework_sq - self.sum_coursework ** 2
+        spread_exam = n * self.sum_exam_sq - self.sum_exam ** 2
+        if spread_coursework <= 0 or spread_exam <= 0:
+            return 0.0
+        return covariance / math.sqrt(spread_coursework * spread_exam)
+
+
+# ============================================================================
+# WORKERS
+# ============================================================================
+
+def analyse_range(filename, start, end):
+    """
+    Reads the records whose lines start inside [start, end) of a marks
+    file and returns a CohortStats for them.
+
+    A range that starts part way through a line skips to the next line,
+    the worker for the previous range reads that line instead. The
+    header line (the student count) has no commas and is ignored.
+    """
+    stats = CohortStats()
+    with open(filename, "rb") as file:
+        if start > 0:
+            file.seek(start - 1)
+            file.readline()  # Finish the line that belongs to the previous range
+        while file.tell() < end:
+            line = file.readline()
+            if not line:
+                break
+            if b"," not in line:
+                continue
+            code, name, course1, course2, course3, exam = parse_record(line.decode("utf-8"))
+            stats.add(course1 + course2 + course3, exam)
+    return stats
+
+
+def split_files(filenames, chunk_size=CHUNK_SIZE):
+    """
+    Turns a list of files into (filename, start, end) jobs, one per file
+    or one per chunk for files larger than chunk_size.
+    """
+    jobs = []
+    for filename in filenames:
+        size = os.path.getsize(filename)
+        start = 0
+        while True:
+            end = min(start + chunk_size, size)
+            jobs.append((filename, start, end))
+            if end >= size:
+                break
+            start = end
+    return jobs
+
+
+def _analyse_job(job):
+    """
+    Unpacks a job tuple for the process pool.
+    """
+    return analyse_range(*job)
+
+
+def analyse_files(filenames, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    Analyses many marks files at once and returns one merged CohortStats.
+
+    Parameters:
+        filenames: Paths of the marks files to read
+        workers: Number of worker processes (None for one per core,
+                 1 to run everything in this process)
+        chunk_size: Largest byte range handed to a single worker
+    """
+    jobs = split_files(filenames, chunk_size)
+    total = CohortStats()
+
+    if workers == 1:
+        for job in jobs:
+            total.merge(_analyse_job(job))
+        return total
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for stats in pool.map(_analyse_job, jobs):
+            total.merge(stats)
+    return total
+
+
+def print_report(stats):
+    """
+    Prints a short summary of a CohortStats.
+    """
+    print(f"Students: {stats.count}")
+    print(f"Average percentage: {stats.average_percentage():.2f}%")
+    print("Grades: " + ", ".join(f"{grade}={amount}"
+                                 for grade, amount in stats.grade_distribution().items()))
+    print("Percentiles: " + ", ".join(f"{int(fraction * 100)}th={value:.1f}%"
+                                      for fraction, value in stats.percentile_bands().items()))
+    print(f"Coursework/exam correlation: {stats.correlation():.3f}")
+
+
+if __name__ == "__main__":
+    import sys
+    from marksengine import MARKS_FILE
+
+    print_report(analyse_files(sys.argv[1:] or [MARKS_FILE]))
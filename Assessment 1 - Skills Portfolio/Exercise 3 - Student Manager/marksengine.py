@@ -0,0 +1,543 @@
+from array import array
+import bisect
+import mmap
+import os
+import struct
+import sys
+
+# Folder this script lives in, used to find the resources folder
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Default location of the student marks file
+MARKS_FILE = os.path.join(script_dir, "..", "A1 - Resources", "studentMarks.txt")
+
+# Per-student quiz results written by the Maths Quiz's quizexport.py
+QUIZ_RESULTS_FILE = os.path.join(script_dir, "..", "A1 - Resources", "quizResults.txt")
+
+# Binary snapshot format. The header is followed by the name offsets,
+# the fixed width columns and finally the UTF-8 names blob.
+SNAPSHOT_MAGIC = b"SMKS"
+SNAPSHOT_VERSION = 2  # Version 2 has 32-bit student codes
+SNAPSHOT_HEADER = struct.Struct("<4sHc1xQQQQ")
+BYTE_ORDER = b"l" if sys.byteorder == "little" else b"b"
+
+# Array type of the student code column. 32 bits, so district files
+# with codes wider than 4 digits still fit
+CODE_TYPECODE = "I"
+
+# Keys the records can be sorted by
+SORT_KEYS = ("name", "code", "total", "exam")
+
+# Which sort keys are affected when a field of a record changes
+AFFECTED_KEYS = {
+    "code": ("code",),
+    "name": ("name",),
+    "course1": ("total",),
+    "course2": ("total",),
+    "course3": ("total",),
+    "exam": ("total", "exam"),
+}
+
+# ============================================================================
+# MARK CALCULATIONS
+# ============================================================================
+
+def calculate_percentage(coursework_total, exam_mark):
+    """
+    Works out the overall percentage out of the 160 marks available
+    (60 for coursework and 100 for the exam).
+    """
+    return (coursework_total + exam_mark) / 160 * 100
+
+
+def calculate_grade(percentage):
+    """
+    Returns the grade letter for a percentage.
+    A: 70+, B: 60-69, C: 50-59, D: 40-49, F: under 40
+    """
+    if percentage >= 70:
+        return "A"
+    elif percentage >= 60:
+        return "B"
+    elif percentage >= 50:
+        return "C"
+    elif percentage >= 40:
+        return "D"
+    else:
+        return "F"
+
+
+def parse_record(line):
+    """
+    Turns one line of the marks file into a record tuple:
+    (code, name, course1, course2, course3, exam)
+    """
+    code, name, course1, course2, course3, exam = line.strip().split(",")
+    return (int(code), name.strip(), int(course1), int(course2),
+            int(course3), int(exam))
+
+
+def parse_quiz_result(line):
+    """
+    Turns one line of the quiz results file into
+    (code, best score, mean score, attempts)
+    """
+    code, best, mean, attempts = line.strip().split(",")
+    return int(code), int(best), float(mean), int(attempts)
+
+
+# ============================================================================
+# SNAPSHOT NAMES
+# ============================================================================
+
+class SnapshotNames:
+    """
+    Read-only list of names backed by a memory-mapped snapshot.
+    Names are only decoded when they are looked at, so opening a
+    snapshot does not create millions of strings up front.
+    """
+
+    def __init__(self, blob, offsets):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        return str(self.blob[self.offsets[index]:self.offsets[index + 1]], "utf-8")
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+# ============================================================================
+# MARKS STORE
+# ============================================================================
+
+class MarksStore:
+    """
+    Holds every student record in columns (one array per field) so a
+    row is just an index into each column.
+
+    Sorted views are kept as permutations: a list of row indexes in
+    sorted order. Each permutation is only built the first time it is
+    asked for and then cached. Adding, updating or deleting a record
+    patches the cached permutations in place instead of sorting again,
+    and only the keys affected by the change are touched.
+    """
+
+    def __init__(self):
+        self.codes = array(CODE_TYPECODE)
+        self.names = []
+        self.course1 = array("B")
+        self.course2 = array("B")
+        self.course3 = array("B")
+        self.exams = array("B")
+
+        # Cached ascending permutations, one per sort key
+        self._permutations = {}
+
+        # Memory map backing the columns when loaded from a snapshot
+        self._snapshot_map = None
+
+        # Quiz results by student code: code -> (best, mean, attempts).
+        # Kept by code rather than by row so adding and deleting records
+        # never has to touch it.
+        self.quiz_results = {}
+
+    @classmethod
+    def load(cls, filename=MARKS_FILE):
+        """
+        Loads a store as quickly as possible. If a snapshot next to the
+        marks file is still up to date it is memory-mapped, otherwise the
+        text file is parsed and a fresh snapshot is written for next time.
+        """
+        snapshot_filename = filename + ".snapshot"
+        source = os.stat(filename)
+
+        store = cls.open_snapshot(snapshot_filename, source)
+        if store is not None:
+            return store
+
+        store = cls.from_file(filename)
+        try:
+            store.save_snapshot(snapshot_filename, source)
+        except OSError:
+            pass  # Read-only folder, we just parse the text again next time
+        return store
+
+    @classmethod
+    def from_file(cls, filename=MARKS_FILE):
+        """
+        Loads a store from a marks file. The first line is the number
+        of students, every other line is one student record.
+        """
+        store = cls()
+        with open(filename, "r", encoding="utf-8") as file:
+            file.readline()  # Skip the student count, we count rows ourselves
+            for line in file:
+                if line.strip():
+                    store._append(*parse_record(line))
+        return store
+
+    def save(self, filename=MARKS_FILE):
+        """
+        Writes every record back to the marks file in the same format
+        it was loaded from.
+        """
+        with open(filename, "w", encoding="utf-8") as file:
+            file.write(f"{len(self)}\n")
+            for index in range(len(self)):
+                code, name, course1, course2, course3, exam = self.get_raw(index)
+                file.write(f"{code},{name},{course1},{course2},{course3},{exam}\n")
+
+    def __len__(self):
+        return len(self.codes)
+
+    # ------------------------------------------------------------------
+    # Binary snapshot
+    # ------------------------------------------------------------------
+
+    def save_snapshot(self, snapshot_filename, source):
+        """
+        Writes the columns to a binary snapshot file.
+
+        Parameters:
+            snapshot_filename: Where to write the snapshot
+            source: os.stat() of the marks file the snapshot was built
+                    from, used later to tell if the snapshot is stale
+        """
+        count = len(self)
+        encoded = [self.names[index].encode("utf-8") for index in range(count)]
+
+        offsets = array("Q", [0])
+        position = 0
+        for name in encoded:
+            position += len(name)
+            offsets.append(position)
+
+        header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, BYTE_ORDER,
+                                      count, source.st_size, source.st_mtime_ns,
+                                      position)
+
+        # Write to a temporary file first so a half written snapshot is
+        # never picked up
+        temporary = snapshot_filename + ".tmp"
+        with open(temporary, "wb") as file:
+            file.write(header)
+            offsets.tofile(file)
+            for column in (self.codes, self.course1, self.course2,
+                           self.course3, self.exams):
+                file.write(column)
+            for name in encoded:
+                file.write(name)
+        os.replace(temporary, snapshot_filename)
+
+    @classmethod
+    def open_snapshot(cls, snapshot_filename, source):
+        """
+        Memory-maps a snapshot and returns a store that reads straight
+        from it. Returns None if the snapshot is missing, truncated, was
+        written by a different version or no longer matches the marks file.
+        """
+        try:
+            with open(snapshot_filename, "rb") as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        if len(mapped) < SNAPSHOT_HEADER.size:
+            mapped.close()
+            return None
+
+        (magic, version, byte_order, count, source_size, source_mtime,
+         names_size) = SNAPSHOT_HEADER.unpack_from(mapped)
+        if (magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION
+                or byte_order != BYTE_ORDER
+                or source_size != source.st_size
+                or source_mtime != source.st_mtime_ns):
+            mapped.close()
+            return None
+
+        # A snapshot cut short (disk full, copied half way) is rebuilt
+        # rather than read past its end
+        code_size = array(CODE_TYPECODE).itemsize
+        expected_size = (SNAPSHOT_HEADER.size + (count + 1) * 8
+                         + count * (code_size + 4) + names_size)
+        if len(mapped) != expected_size:
+            mapped.close()
+            return None
+
+        view = memoryview(mapped)
+        position = SNAPSHOT_HEADER.size
+
+        def take(size, typecode):
+            nonlocal position
+            column = view[position:position + size].cast(typecode)
+            position += size
+            return column
+
+        store = cls()
+        offsets = take((count + 1) * 8, "Q")
+        store.codes = take(count * code_size, CODE_TYPECODE)
+        store.course1 = take(count, "B")
+        store.course2 = take(count, "B")
+        store.course3 = take(count, "B")
+        store.exams = take(count, "B")
+        store.names = SnapshotNames(view[position:position + names_size], offsets)
+        store._snapshot_map = mapped
+        return store
+
+    def _make_writable(self):
+        """
+        Copies the memory-mapped columns into normal arrays and lists the
+        first time a snapshot backed store is changed.
+        """
+        if self._snapshot_map is None:
+            return
+        for field in ("codes", "course1", "course2", "course3", "exams"):
+            column = array(getattr(self, field).format)
+            column.frombytes(getattr(self, field).cast("B"))
+            setattr(self, field, column)
+        self.names = list(self.names)
+        # The memory map is left for the garbage collector, closing it
+        # here would fail while memoryviews of it still exist
+        self._snapshot_map = None
+
+    # ------------------------------------------------------------------
+    # Reading records
+    # ------------------------------------------------------------------
+
+    def get_raw(self, index):
+        """
+        Returns the record at a row index exactly as stored in the file.
+        """
+        return (self.codes[index], self.names[index], self.course1[index],
+                self.course2[index], self.course3[index], self.exams[index])
+
+    def get_record(self, index):
+        """
+        Returns the record at a row index in the "view all" format:
+        (name, code, coursework total, exam, percentage, grade)
+        """
+        coursework = self.coursework_total(index)
+        exam = self.exams[index]
+        percentage = calculate_percentage(coursework, exam)
+        return (self.names[index], self.codes[index], coursework, exam,
+                percentage, calculate_grade(percentage))
+
+    def coursework_total(self, index):
+        """
+        Returns the sum of the three coursework marks for a row.
+        """
+        return self.course1[index] + self.course2[index] + self.course3[index]
+
+    def overall_total(self, index):
+        """
+        Returns coursework plus exam (out of 160) for a row.
+        """
+        return self.coursework_total(index) + self.exams[index]
+
+    def load_quiz_results(self, filename=QUIZ_RESULTS_FILE):
+        """
+        Reads the quiz results file so they can be joined to the records.
+        A missing file just means no student has quiz results yet.
+        Returns the number of students with quiz results.
+        """
+        self.quiz_results = {}
+        try:
+            with open(filename, "r", encoding="utf-8") as file:
+                for line in file:
+                    if line.strip():
+                        code, best, mean, attempts = parse_quiz_result(line)
+                        self.quiz_results[code] = (best, mean, attempts)
+        except FileNotFoundError:
+            pass
+        return len(self.quiz_results)
+
+    def get_quiz_result(self, index):
+        """
+        Returns (best, mean, attempts) of the quiz results for the
+        student at a row index, or None if they haven't taken a quiz.
+        """
+        return self.quiz_results.get(self.codes[index])
+
+    def find_code(self, code):
+        """
+        Returns the row index of a student code, or None if not found.
+        Uses the code permutation so repeated lookups are O(log n).
+        """
+        permutation = self.sorted_indexes("code")
+        position = bisect.bisect_left(permutation, (code, -1),
+                                      key=self._key_function("code"))
+        if position < len(permutation) and self.codes[permutation[position]] == code:
+            return permutation[position]
+        return None
+
+    # ------------------------------------------------------------------
+    # Sorted views
+    # ------------------------------------------------------------------
+
+    def _key_function(self, key):
+        """
+        Returns a function that maps a row index to its sort key.
+        The row index is added as a tie breaker so every row has a
+        unique position and can be found again with a binary search.
+        Deleting a row shifts later indexes down by one, which keeps
+        their order, so the tie breaker stays valid.
+        """
+        if key == "name":
+            names = self.names
+            return lambda index: (names[index].lower(), index)
+        elif key == "code":
+            codes = self.codes
+            return lambda index: (codes[index], index)
+        elif key == "total":
+            return lambda index: (self.overall_total(index), index)
+        elif key == "exam":
+            exams = self.exams
+            return lambda index: (exams[index], index)
+        raise ValueError(f"Unknown sort key: {key}")
+
+    def sorted_indexes(self, key, descending=False):
+        """
+        Returns the row indexes sorted by a key.
+
+        The ascending permutation is built on first use and cached, the
+        descending order is simply the cached list read backwards, so
+        switching between orders never sorts again.
+
+        The ascending list is the cached permutation itself and is kept
+        up to date by add, update and delete. The descending list is a
+        copy and must be asked for again after a change.
+
+        Parameters:
+            key: One of SORT_KEYS
+            descending: True for highest first
+        """
+        permutation = self._permutations.get(key)
+        if permutation is None:
+            permutation = sorted(range(len(self)), key=self._key_function(key))
+            self._permutations[key] = permutation
+        if descending:
+            return permutation[::-1]
+        return permutation
+
+    def sorted_records(self, key, descending=False):
+        """
+        Yields records in the "view all" format in sorted order.
+        """
+        for index in self.sorted_indexes(key, descending):
+            yield self.get_record(index)
+
+    def _insert_into_permutations(self, index, keys):
+        """
+        Puts a row into the cached permutations for the given keys at
+        its sorted position using a binary search.
+        """
+        for key in keys:
+            permutation = self._permutations.get(key)
+            if permutation is not None:
+                key_function = self._key_function(key)
+                bisect.insort(permutation, index, key=key_function)
+
+    def _remove_from_permutations(self, index, keys):
+        """
+        Takes a row out of the cached permutations for the given keys.
+        Must be called while the row still holds its old values.
+        """
+        for key in keys:
+            permutation = self._permutations.get(key)
+            if permutation is not None:
+                key_function = self._key_function(key)
+                position = bisect.bisect_left(permutation, key_function(index),
+                                              key=key_function)
+                del permutation[position]
+
+    # ------------------------------------------------------------------
+    # Changing records
+    # ------------------------------------------------------------------
+
+    def _append(self, code, name, course1, course2, course3, exam):
+        """
+        Adds a row to the columns without touching the permutations.
+        """
+        self._make_writable()
+        self.codes.append(code)
+        self.names.append(name)
+        self.course1.append(course1)
+        self.course2.append(course2)
+        self.course3.append(course3)
+        self.exams.append(exam)
+
+    def add_record(self, code, name, course1, course2, course3, exam):
+        """
+        Adds a new student and returns its row index.
+        """
+        self._append(code, name, course1, course2, course3, exam)
+        index = len(self) - 1
+        self._insert_into_permutations(index, SORT_KEYS)
+        return index
+
+    def update_record(self, index, **fields):
+        """
+        Changes one or more fields of a record, e.g.
+        update_record(3, exam=75). Only the permutations that depend on
+        the changed fields are updated.
+        """
+        self._make_writable()
+        columns = {
+            "code": self.codes,
+            "name": self.names,
+            "course1": self.course1,
+            "course2": self.course2,
+            "course3": self.course3,
+            "exam": self.exams,
+        }
+
+        affected = set()
+        for field in fields:
+            if field not in columns:
+                raise ValueError(f"Unknown field: {field}")
+            affected.update(AFFECTED_KEYS[field])
+
+        old_values = {field: columns[field][index] for field in fields}
+        self._remove_from_permutations(index, affected)
+        try:
+            for field, value in fields.items():
+                columns[field][index] = value
+        except (OverflowError, TypeError):
+            # e.g. exam=300 does not fit a byte column. Put the old values
+            # back so the row goes back where it was in the permutations
+            for field, value in old_values.items():
+                columns[field][index] = value
+            raise
+        finally:
+            self._insert_into_permutations(index, affected)
+
+    def delete_record(self, index):
+        """
+        Removes a record. Rows after it move up by one, so the cached
+        permutations are renumbered in a single pass instead of being
+        sorted again. The renumbering is done in place, so a list
+        returned earlier by sorted_indexes() stays in step.
+        """
+        self._make_writable()
+        self._remove_from_permutations(index, SORT_KEYS)
+
+        del self.codes[index]
+        del self.names[index]
+        del self.course1[index]
+        del self.course2[index]
+        del self.course3[index]
+        del self.exams[index]
+
+        # Deleting the last row leaves every other index unchanged
+        if index == len(self):
+            return
+        for permutation in self._permutations.values():
+            permutation[:] = [row - 1 if row > index else row for row in permutation]
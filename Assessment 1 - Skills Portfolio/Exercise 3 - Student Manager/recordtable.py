@@ -0,0 +1,211 @@
+from tkinter import *
+
+# ============================================================================
+# VIRTUAL TABLE WIDGET
+# ============================================================================
+
+class VirtualTable(Frame):
+    """
+    A scrolling table that only ever draws the rows that fit on screen.
+
+    Instead of one Label per field per student, the table keeps a fixed
+    grid of canvas text items (visible rows x columns). Scrolling just
+    changes which row index sits at the top and asks get_row() for the
+    values of the rows now on screen, so the number of widgets and the
+    memory used stay the same whether there are 10 rows or 1,000,000.
+
+    Parameters:
+        parent: The frame or window to put the table in
+        columns: List of (heading, width in pixels) tuples
+        row_count: How many rows there are in total
+        get_row: Function that takes a row index and returns a tuple of
+                 the values to show, one per column
+        visible_rows: How many rows fit on screen at once
+        row_height: Height of each row in pixels
+    """
+
+    def __init__(self, parent, columns, row_count, get_row,
+                 visible_rows=15, row_height=24, **kwargs):
+        super().__init__(parent, **kwargs)
+
+        self.columns = columns
+        self.row_count = row_count
+        self.get_row = get_row
+        self.visible_rows = visible_rows
+        self.row_height = row_height
+        self.first_row = 0
+        self._redraw_pending = None
+
+        width = sum(column_width for heading, column_width in columns)
+
+        # Heading row
+        header = Frame(self, bg="#1e3a8a", width=width, height=row_height + 4)
+        header.grid(row=0, column=0, sticky=EW)
+        x = 0
+        for heading, column_width in columns:
+            Label(header, text=heading,
+                  font=("Arial", 11, "bold"),
+                  bg="#1e3a8a", fg="white",
+                  anchor=W, padx=6).place(x=x, y=2, width=column_width)
+            x += column_width
+
+        # Canvas holding the fixed grid of cells
+        self.canvas = Canvas(self, width=width,
+                             height=visible_rows * row_height,
+                             bg="white", highlightthickness=0)
+        self.canvas.grid(row=1, column=0, sticky=NSEW)
+
+        self.scrollbar = Scrollbar(self, orient=VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.grid(row=1, column=1, sticky=NS)
+
+        # Create the cells once, they are reused for every row index
+        self.cells = []
+        for row in range(visible_rows):
+            top = row * row_height
+            if row % 2 == 1:
+                self.canvas.create_rectangle(0, top, width, top + row_height,
+                                             fill="#f1f5f9", outline="")
+            x = 0
+            row_cells = []
+            for heading, column_width in columns:
+                item = self.canvas.create_text(x + 6, top + row_height // 2,
+                                               text="", anchor=W,
+                                               font=("Arial", 11),
+                                               fill="#1f2937")
+                row_cells.append(item)
+                x += column_width
+            self.cells.append(row_cells)
+
+        # Mouse wheel (Windows/macOS) and buttons 4/5 (Linux)
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Button-4>", lambda event: self.scroll_by(-3))
+        self.canvas.bind("<Button-5>", lambda event: self.scroll_by(3))
+
+        # Keyboard scrolling once the table has focus
+        self.canvas.bind("<Button-1>", lambda event: self.canvas.focus_set())
+        self.canvas.bind("<Up>", lambda event: self.scroll_by(-1))
+        self.canvas.bind("<Down>", lambda event: self.scroll_by(1))
+        self.canvas.bind("<Prior>", lambda event: self.scroll_by(-self.visible_rows))
+        self.canvas.bind("<Next>", lambda event: self.scroll_by(self.visible_rows))
+        self.canvas.bind("<Home>", lambda event: self.scroll_to(0))
+        self.canvas.bind("<End>", lambda event: self.scroll_to(self.row_count))
+
+        self.refresh()
+
+    # ------------------------------------------------------------------
+    # Scrolling
+    # ------------------------------------------------------------------
+
+    def scroll_to(self, first_row):
+        """
+        Makes first_row the top visible row (clamped to the data).
+        """
+        last_start = max(0, self.row_count - self.visible_rows)
+        first_row = max(0, min(int(first_row), last_start))
+        if first_row != self.first_row:
+            self.first_row = first_row
+            self.refresh()
+
+    def scroll_by(self, rows):
+        """
+        Moves the view up (negative) or down (positive) by some rows.
+        """
+        self.scroll_to(self.first_row + rows)
+
+    def _on_scrollbar(self, *args):
+        """
+        Handles the scrollbar's "moveto" and "scroll" commands.
+        """
+        if args[0] == "moveto":
+            self.scroll_to(float(args[1]) * self.row_count)
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            if args[2] == "pages":
+                amount *= self.visible_rows
+            self.scroll_by(amount)
+
+    def _on_mousewheel(self, event):
+        """
+        Scrolls three rows per wheel notch.
+        """
+        if event.delta > 0:
+            self.scroll_by(-3)
+        elif event.delta < 0:
+            self.scroll_by(3)
+
+    # ------------------------------------------------------------------
+    # Drawing
+    # ------------------------------------------------------------------
+
+    def set_row_count(self, row_count):
+        """
+        Changes the total number of rows, e.g. after adding or deleting a
+        record or switching to a different sorted view.
+        """
+        self.row_count = row_count
+        self.first_row = max(0, min(self.first_row, row_count - self.visible_rows))
+        self.refresh()
+
+    def refresh(self):
+        """
+        Redraws the visible rows. Many scroll events in a row only cause
+        one redraw, which happens when Tk is next idle.
+        """
+        if self._redraw_pending is None:
+            self._redraw_pending = self.after_idle(self._redraw)
+
+    def _redraw(self):
+        """
+        Fills the cells with the values of the rows now on screen.
+        """
+        self._redraw_pending = None
+
+        for row, row_cells in enumerate(self.cells):
+            index = self.first_row + row
+            if index < self.row_count:
+                values = self.get_row(index)
+            else:
+                values = ("",) * len(row_cells)
+            for item, value in zip(row_cells, values):
+                self.canvas.itemconfigure(item, text=value)
+
+        if self.row_count:
+            self.scrollbar.set(self.first_row / self.row_count,
+                               (self.first_row + self.visible_rows) / self.row_count)
+        else:
+            self.scrollbar.set(0, 1)
+
+
+# ============================================================================
+# DEMO
+# ============================================================================
+
+if __name__ == "__main__":
+    from marksengine import MarksStore
+
+    store = MarksStore.load()
+    store.load_quiz_results()
+    order = store.sorted_indexes("name")
+
+    def get_student_row(row):
+        """
+        Returns the values for one row of the "view all" table.
+        """
+        name, code, coursework, exam, percentage, grade = store.get_record(order[row])
+        quiz = store.get_quiz_result(order[row])
+        best_quiz = quiz[0] if quiz is not None else "-"
+        return (name, code, coursework, exam, f"{percentage:.1f}%", grade, best_quiz)
+
+    root = Tk()
+    root.title("All Student Records")
+    root.resizable(False, False)
+
+    table = VirtualTable(root,
+                         columns=[("Name", 200), ("Number", 90), ("Coursework", 110),
+                                  ("Exam", 80), ("Overall", 90), ("Grade", 70),
+                                  ("Best Quiz", 90)],
+                         row_count=len(order),
+                         get_row=get_student_row)
+    table.pack(padx=10, pady=10)
+
+    root.mainloop()
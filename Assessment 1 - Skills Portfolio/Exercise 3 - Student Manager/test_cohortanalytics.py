@@ -0,0 +1,24 @@
+import random
+
+from cohortanalytics import CohortStats, analyse_files
+
+
+def test_chunked_analysis_matches_single_pass(tmp_path):
+    generator = random.Random(3)
+    paths = []
+    expected = CohortStats()
+    for number in range(3):
+        path = tmp_path / f"marks{number}.txt"
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("200\n")
+            for row in range(200):
+                marks = [generator.randint(0, 20) for _ in range(3)]
+                exam = generator.randint(0, 100)
+                file.write(f"{1000 + row},Student {row},{marks[0]},{marks[1]},"
+                           f"{marks[2]},{exam}\n")
+                expected.add(sum(marks), exam)
+        paths.append(str(path))
+
+    # Small chunks so most ranges start and end part way through a line
+    result = analyse_files(paths, workers=1, chunk_size=97)
+    assert vars(result) == vars(expected)
@@ -0,0 +1,188 @@
+import os
+import random
+
+import pytest
+
+from marksengine import SORT_KEYS, MarksStore
+
+
+def random_record(generator):
+    """
+    Returns a random record. Codes come from a small range so there are
+    plenty of duplicates to test the tie breaker.
+    """
+    name = generator.choice(["Ann", "bob", "Cara", "dev", "Eve"]) + " " + \
+        generator.choice(["Smith", "Jones", "Lee"])
+    return (generator.randint(1000, 1050), name,
+            generator.randint(0, 20), generator.randint(0, 20),
+            generator.randint(0, 20), generator.randint(0, 100))
+
+
+def expected_order(store, key):
+    """
+    The order a full sort gives, with the row index as the tie breaker.
+    """
+    values = {
+        "name": lambda index: store.names[index].lower(),
+        "code": lambda index: store.codes[index],
+        "total": store.overall_total,
+        "exam": lambda index: store.exams[index],
+    }[key]
+    return sorted(range(len(store)), key=lambda index: (values(index), index))
+
+
+def write_marks(path, records):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(f"{len(records)}\n")
+        for record in records:
+            file.write(",".join(str(value) for value in record) + "\n")
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_permutations_match_sorted_after_changes(seed):
+    generator = random.Random(seed)
+    store = MarksStore()
+    for _ in range(50):
+        store.add_record(*random_record(generator))
+
+    # Build every permutation first so the changes have to patch them
+    for key in SORT_KEYS:
+        store.sorted_indexes(key)
+
+    for _ in range(300):
+        action = generator.random()
+        if action < 0.4 or len(store) < 5:
+            store.add_record(*random_record(generator))
+        elif action < 0.75:
+            code, name, course1, course2, course3, exam = random_record(generator)
+            fields = generator.choice([{"exam": exam}, {"name": name, "code": code},
+                                       {"course2": course2}, {"course1": course1,
+                                                              "course3": course3}])
+            store.update_record(generator.randrange(len(store)), **fields)
+        else:
+            store.delete_record(generator.randrange(len(store)))
+
+        for key in SORT_KEYS:
+            expected = expected_order(store, key)
+            assert store.sorted_indexes(key) == expected
+            assert store.sorted_indexes(key, descending=True) == expected[::-1]
+
+
+def test_find_code():
+    store = MarksStore()
+    for code in (5000, 1200, 123456, 1200):
+        store.add_record(code, "Someone", 1, 2, 3, 4)
+    assert store.codes[store.find_code(123456)] == 123456
+    assert store.codes[store.find_code(1200)] == 1200
+    assert store.find_code(9999) is None
+
+
+def test_save_and_from_file_round_trip(tmp_path):
+    generator = random.Random(1)
+    store = MarksStore()
+    for _ in range(20):
+        store.add_record(*random_record(generator))
+    path = tmp_path / "marks.txt"
+    store.save(str(path))
+
+    loaded = MarksStore.from_file(str(path))
+    assert [loaded.get_raw(index) for index in range(len(loaded))] == \
+        [store.get_raw(index) for index in range(len(store))]
+
+
+def test_held_permutation_follows_deletes():
+    generator = random.Random(6)
+    store = MarksStore()
+    for _ in range(30):
+        store.add_record(*random_record(generator))
+    order = store.sorted_indexes("name")
+
+    for _ in range(10):
+        store.delete_record(generator.randrange(len(store)))
+        assert order is store.sorted_indexes("name")
+        assert order == expected_order(store, "name")
+        for index in order:
+            store.get_record(index)
+
+
+def test_invalid_update_keeps_permutations():
+    generator = random.Random(7)
+    store = MarksStore()
+    for _ in range(10):
+        store.add_record(*random_record(generator))
+    for key in SORT_KEYS:
+        store.sorted_indexes(key)
+    before = store.get_raw(4)
+
+    with pytest.raises(OverflowError):
+        store.update_record(4, course1=5, exam=300)
+    with pytest.raises(TypeError):
+        store.update_record(4, name="Renamed", code="not a number")
+
+    assert store.get_raw(4) == before
+    for key in SORT_KEYS:
+        assert store.sorted_indexes(key) == expected_order(store, key)
+
+
+def test_snapshot_round_trip(tmp_path):
+    generator = random.Random(2)
+    records = [random_record(generator) for _ in range(100)]
+    records.append((4000000000, "Wide Code", 1, 2, 3, 4))
+    path = str(tmp_path / "marks.txt")
+    write_marks(path, records)
+
+    parsed = MarksStore.load(path)
+    assert parsed._snapshot_map is None
+    assert os.path.exists(path + ".snapshot")
+
+    mapped = MarksStore.load(path)
+    assert mapped._snapshot_map is not None
+    assert [mapped.get_raw(index) for index in range(len(mapped))] == records
+
+    # Changing a snapshot backed store copies it into normal columns
+    mapped.update_record(0, exam=99)
+    mapped.add_record(1234, "New Student", 5, 5, 5, 50)
+    assert mapped.get_raw(0)[5] == 99
+    assert mapped.sorted_indexes("exam") == expected_order(mapped, "exam")
+
+
+def test_stale_snapshot_is_ignored(tmp_path):
+    path = str(tmp_path / "marks.txt")
+    write_marks(path, [(1000, "Old", 1, 1, 1, 1)])
+    MarksStore.load(path)
+
+    write_marks(path, [(1000, "New", 2, 2, 2, 2), (1001, "Other", 3, 3, 3, 3)])
+    os.utime(path, ns=(0, 1))
+    store = MarksStore.load(path)
+    assert store._snapshot_map is None
+    assert [store.get_raw(index) for index in range(len(store))] == \
+        [(1000, "New", 2, 2, 2, 2), (1001, "Other", 3, 3, 3, 3)]
+
+
+@pytest.mark.parametrize("cut", [1, 5, 30])
+def test_truncated_snapshot_is_rebuilt(tmp_path, cut):
+    records = [(1000, "Alan Turing", 1, 2, 3, 4), (1001, "Ada Lovelace", 5, 6, 7, 8)]
+    path = str(tmp_path / "marks.txt")
+    write_marks(path, records)
+    MarksStore.load(path)
+
+    snapshot = path + ".snapshot"
+    size = os.path.getsize(snapshot)
+    os.truncate(snapshot, size - cut)
+    store = MarksStore.load(path)
+    assert store._snapshot_map is None
+    assert [store.get_raw(index) for index in range(len(store))] == records
+    assert os.path.getsize(snapshot) == size
+
+
+def test_quiz_results_join(tmp_path):
+    store = MarksStore()
+    store.add_record(1000, "Ann", 1, 1, 1, 1)
+    store.add_record(2000, "Bob", 1, 1, 1, 1)
+    results = tmp_path / "quizResults.txt"
+    results.write_text("2000,90,72.5,4\n", encoding="utf-8")
+
+    assert store.load_quiz_results(str(results)) == 1
+    assert store.get_quiz_result(0) is None
+    assert store.get_quiz_result(1) == (90, 72.5, 4)
+    assert store.load_quiz_results(str(tmp_path / "missing.txt")) == 0
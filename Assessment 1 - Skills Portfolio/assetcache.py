@@ -0,0 +1,216 @@
+from tkinter import PhotoImage, TclError
+import hashlib
+import os
+import queue
+import tempfile
+import threading
+
+# Folder this script is located in
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Pre-scaled images are kept here between launches
+CACHE_DIR = os.path.join(script_dir, ".asset_cache")
+
+# How often (ms) the Tk loop checks for images finished on the worker thread
+POLL_MS = 15
+
+# PIL is only imported the first time an image has to be scaled
+# None means not tried yet, False means it isn't installed
+PIL_MODULE = None
+
+# PhotoImages already made in this run, keyed by (path, size)
+photos = {}
+
+# (path, size) of images that couldn't be loaded in this run, so they
+# aren't read and hashed again every time a screen asks for them
+failed = set()
+
+# Background worker state
+_jobs = queue.Queue()
+_results = queue.Queue()
+_waiting = {}  # (path, size) -> list of callbacks
+_worker = None
+_polling = False
+
+# ============================================================================
+# DISK CACHE
+# ============================================================================
+
+def get_pil():
+    """
+    Imports PIL's Image module the first time it is needed.
+    Returns None if PIL isn't installed.
+    """
+    global PIL_MODULE
+    if PIL_MODULE is None:
+        try:
+            from PIL import Image
+            PIL_MODULE = Image
+        except ImportError:
+            PIL_MODULE = False
+    return PIL_MODULE or None
+
+
+def cache_path(source_bytes, size):
+    """
+    Returns the cache file for an image's contents scaled to size.
+    The key is a hash of the source file, so editing or replacing an
+    image automatically gives it a new cache entry.
+    """
+    digest = hashlib.sha1(source_bytes).hexdigest()
+    width, height = size
+    return os.path.join(CACHE_DIR, f"{digest}_{width}x{height}.ppm")
+
+
+def prepare_image(image_path, size):
+    """
+    Returns the image as display-ready PPM bytes at the given size.
+
+    On a cache hit this is just reading a file. On a miss PIL scales
+    the source once and the result is saved for next time. Safe to
+    call from any thread since it doesn't touch Tk. Returns None if
+    the image can't be loaded.
+    """
+    try:
+        with open(image_path, "rb") as file:
+            source_bytes = file.read()
+    except OSError:
+        return None
+
+    cached = cache_path(source_bytes, size)
+    try:
+        with open(cached, "rb") as file:
+            return file.read()
+    except OSError:
+        pass  # Not cached yet
+
+    Image = get_pil()
+    if Image is None:
+        return None
+    try:
+        img = Image.open(image_path).convert("RGB").resize(size)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+
+        # Write to a temporary file first so a half written file is never
+        # used (mkstemp gives a name no other thread or process is using)
+        handle, temporary = tempfile.mkstemp(suffix=".tmp", dir=CACHE_DIR)
+        os.close(handle)
+        try:
+            img.save(temporary, format="PPM")
+            os.replace(temporary, cached)
+        except Exception:
+            os.remove(temporary)
+            raise
+
+        with open(cached, "rb") as file:
+            return file.read()
+    except Exception:
+        return None
+
+
+# ============================================================================
+# LOADING INTO TK
+# ============================================================================
+
+def make_photo(master, data):
+    """
+    Turns PPM bytes into a PhotoImage (Tk reads PPM without PIL).
+    """
+    if data is None:
+        return None
+    try:
+        return PhotoImage(master=master, data=data)
+    except TclError:
+        return None
+
+
+def load_photo(master, image_path, size):
+    """
+    Loads a scaled image straight away on the Tk thread.
+    Returns a PhotoImage or None.
+    """
+    key = (image_path, tuple(size))
+    if key in failed:
+        return None
+    photo = photos.get(key)
+    if photo is None:
+        photo = make_photo(master, prepare_image(image_path, key[1]))
+        if photo is not None:
+            photos[key] = photo
+        else:
+            failed.add(key)
+    return photo
+
+
+def load_photo_async(widget, image_path, size, callback):
+    """
+    Loads a scaled image without blocking the Tk loop.
+
+    Reading and scaling happen on a worker thread; callback(photo) is
+    then called on the Tk thread (photo is None if loading failed).
+    Images already loaded in this run are passed to callback at once.
+
+    Parameters:
+        widget: Any widget of the window the image is for
+        image_path: Path of the source image
+        size: (width, height) to scale to
+        callback: Function to call with the PhotoImage
+    """
+    global _worker, _polling
+
+    key = (image_path, tuple(size))
+    photo = photos.get(key)
+    if photo is not None or key in failed:
+        callback(photo)
+        return
+
+    # Several screens can ask for the same image, only load it once
+    if key in _waiting:
+        _waiting[key].append(callback)
+        return
+    _waiting[key] = [callback]
+    _jobs.put(key)
+
+    if _worker is None:
+        _worker = threading.Thread(target=_work, daemon=True)
+        _worker.start()
+
+    if not _polling:
+        _polling = True
+        root = widget.winfo_toplevel()
+        root.after(POLL_MS, _poll, root)
+
+
+def _work():
+    """
+    Worker thread: prepares queued images one after another.
+    """
+    while True:
+        key = _jobs.get()
+        _results.put((key, prepare_image(*key)))
+
+
+def _poll(root):
+    """
+    Runs on the Tk thread: turns finished images into PhotoImages and
+    hands them to whoever asked for them.
+    """
+    global _polling
+
+    while True:
+        try:
+            key, data = _results.get_nowait()
+        except queue.Empty:
+            break
+        photo = make_photo(root, data)
+        if photo is not None:
+            photos[key] = photo
+        else:
+            failed.add(key)
+        for callback in _waiting.pop(key, []):
+            callback(photo)
+
+    if _waiting:
+        root.after(POLL_MS, _poll, root)
+    else:
+        _polling = False
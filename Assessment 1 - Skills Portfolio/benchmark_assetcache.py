@@ -0,0 +1,97 @@
+"""
+Per-image load time benchmark for assetcache.py
+
+For every background image of both exercises it times:
+  - before: PIL open + resize + ImageTk.PhotoImage (what the apps used to do)
+  - cold:   first load through the cache (scale once and write the cache file)
+  - warm:   load from the cache file on a later launch
+
+Making PhotoImages needs a display. Without one, only the file and
+PIL work is timed and the PhotoImage step is skipped.
+Usage: python benchmark_assetcache.py [repeats]
+"""
+import glob
+import os
+import statistics
+import sys
+import time
+from tkinter import Tk, TclError
+
+import assetcache
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Images and the size each exercise shows them at
+IMAGE_SETS = [
+    ("Exercise 1 - Maths Quiz/images", (700, 500)),
+    ("Exercise 2 - Alexa tell me a joke/images", (800, 600)),
+]
+
+
+def time_it(function, repeats):
+    """
+    Returns the median time of calling function, in milliseconds.
+    """
+    times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+    return statistics.median(times) * 1000
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    try:
+        root = Tk()
+        root.withdraw()
+    except TclError:
+        root = None
+        print("No display: PhotoImage creation is not included\n")
+
+    try:
+        from PIL import Image, ImageTk
+    except ImportError:
+        Image = None
+        print("PIL not installed: 'before' and 'cold' can't be measured\n")
+
+    def before(path, size):
+        img = Image.open(path).resize(size)
+        if root is not None:
+            ImageTk.PhotoImage(img, master=root)
+        else:
+            img.load()
+
+    def cold(path, size):
+        with open(path, "rb") as file:
+            cached = assetcache.cache_path(file.read(), size)
+        if os.path.exists(cached):
+            os.remove(cached)
+        data = assetcache.prepare_image(path, size)
+        if root is not None:
+            assetcache.make_photo(root, data)
+
+    def warm(path, size):
+        data = assetcache.prepare_image(path, size)
+        if root is not None:
+            assetcache.make_photo(root, data)
+
+    print(f"{'image':<28} {'size':>9} {'before':>9} {'cold':>9} {'warm':>9}")
+    for folder, size in IMAGE_SETS:
+        for path in sorted(glob.glob(os.path.join(script_dir, folder, "*"))):
+            name = os.path.basename(path)
+            if Image is not None:
+                before_ms = f"{time_it(lambda: before(path, size), repeats):7.1f}ms"
+                cold_ms = f"{time_it(lambda: cold(path, size), repeats):7.1f}ms"
+            else:
+                before_ms = cold_ms = "n/a"
+            warm_ms = f"{time_it(lambda: warm(path, size), repeats):7.1f}ms"
+            print(f"{name:<28} {size[0]:>4}x{size[1]:<4} {before_ms:>9} {cold_ms:>9} {warm_ms:>9}")
+
+    if root is not None:
+        root.destroy()
+
+
+if __name__ == "__main__":
+    main()
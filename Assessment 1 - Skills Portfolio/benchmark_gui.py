@@ -0,0 +1,333 @@
+"""
+Screen transition benchmark for the Maths Quiz and the Joke Assistant
+
+Both apps are opened in one window through the launcher and driven by
+synthesized clicks and key presses. Each transition (displayMenu,
+show_question, displayResults, get_random_joke, show_frame, ...) is
+timed from the event until Tk is idle again. Widget counts and memory
+(RSS) are sampled as the run goes on, so leaks show up in long runs.
+
+If DISPLAY isn't set a local virtual X server (Xvfb) is started.
+Results are written as JSON so runs from different commits can be
+compared.
+
+Usage: python benchmark_gui.py [--cycles N] [--output results.json]
+"""
+import argparse
+import json
+import os
+import platform
+import select
+import statistics
+import subprocess
+import sys
+import time
+from tkinter import Button, Entry
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, script_dir)
+
+# ============================================================================
+# VIRTUAL DISPLAY
+# ============================================================================
+
+def start_virtual_display(timeout=10):
+    """
+    Starts Xvfb if there is no display yet.
+    Returns the Xvfb process (or None if a display was already set).
+
+    Xvfb picks a free display number itself (-displayfd) and writes it
+    to a pipe once it is ready for connections, so a stale socket file
+    or another server on a fixed number can't be mistaken for ours.
+    """
+    if os.environ.get("DISPLAY"):
+        return None
+
+    read_fd, write_fd = os.pipe()
+    try:
+        process = subprocess.Popen(["Xvfb", "-displayfd", str(write_fd),
+                                    "-screen", "0", "1280x1024x24",
+                                    "-nolisten", "tcp"],
+                                   pass_fds=(write_fd,),
+                                   stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.DEVNULL)
+    except FileNotFoundError:
+        sys.exit("No DISPLAY and Xvfb is not installed")
+    finally:
+        os.close(write_fd)
+
+    # Wait for the display number (the pipe closes if Xvfb dies first)
+    number = b""
+    deadline = time.monotonic() + timeout
+    while not number.endswith(b"\n"):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not select.select([read_fd], [], [], remaining)[0]:
+            break
+        chunk = os.read(read_fd, 16)
+        if not chunk:
+            break
+        number += chunk
+    os.close(read_fd)
+
+    if not number.strip() or process.poll() is not None:
+        if process.poll() is None:
+            process.terminate()
+        sys.exit("Xvfb failed to start")
+
+    os.environ["DISPLAY"] = f":{number.decode().strip()}"
+    return process
+
+
+# ============================================================================
+# MEASURING
+# ============================================================================
+
+def rss_kb():
+    """
+    Returns the current resident memory of this process in KB.
+    """
+    try:
+        with open("/proc/self/status", "r") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def count_widgets(widget):
+    """
+    Returns how many widgets there are under widget (including itself).
+    """
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def find_widget(parent, widget_type, text=None):
+    """
+    Finds the first visible widget of a type under parent, optionally
+    with text in its label.
+    """
+    for child in parent.winfo_children():
+        if isinstance(child, widget_type) and (text is None or text in child.cget("text")):
+            return child
+        found = find_widget(child, widget_type, text)
+        if found is not None:
+            return found
+    return None
+
+
+def click(widget):
+    """
+    Synthesizes a mouse click on a widget: pointer enters, button
+    pressed and released inside it.
+    """
+    widget.event_generate("<Enter>", x=5, y=5)
+    widget.event_generate("<ButtonPress-1>", x=5, y=5)
+    widget.event_generate("<ButtonRelease-1>", x=5, y=5)
+
+
+class TransitionTimer:
+    """
+    Collects event-to-idle times for each named transition.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.times = {}
+
+    def measure(self, name, action):
+        """
+        Runs action (which sends an event or calls a screen function)
+        and times it until Tk has nothing left to do.
+        """
+        self.root.update()
+        started = time.perf_counter()
+        action()
+        self.root.update()
+        self.times.setdefault(name, []).append((time.perf_counter() - started) * 1000)
+
+    def summary(self):
+        result = {}
+        for name, times in self.times.items():
+            ordered = sorted(times)
+            result[name] = {
+                "count": len(times),
+                "median_ms": statistics.median(ordered),
+                "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+                "max_ms": ordered[-1],
+            }
+        return result
+
+
+# ============================================================================
+# SCENARIOS
+# ============================================================================
+
+def capture_delayed_calls(module):
+    """
+    The quiz waits 1-2 seconds before showing the next question. To keep
+    runs fast those delayed calls are captured instead of scheduled, and
+    the benchmark runs (and times) them itself. Short delays, such as the
+    image cache polling, are scheduled as normal.
+    """
+    delayed = []
+    real_after = module.root.after
+
+    def after(ms, func=None, *args):
+        if func is not None and ms >= 1000:
+            delayed.append((func, args))
+            return None
+        return real_after(ms, func, *args)
+
+    module.root.after = after
+    return delayed
+
+
+def quiz_cycle(timer, launcher, quiz, delayed, difficulty):
+    """
+    One full quiz: home -> menu -> 10 questions -> results -> menu -> home.
+    """
+    timer.measure("launcher: open Maths Quiz",
+                  lambda: launcher.open_exercise(*launcher.EXERCISES[0][1:]))
+    timer.measure("quiz: Start Quiz (displayMenu)",
+                  lambda: click(find_widget(quiz.home_frame, Button, "Start Quiz")))
+    timer.measure("quiz: pick difficulty (show_question)",
+                  lambda: click(find_widget(quiz.task_frame, Button, difficulty)))
+
+    for number in range(10):
+        entry = find_widget(quiz.task_frame, Entry)
+        answer = quiz.current_questions[quiz.current_index][1]
+
+        # Every third question gets a wrong first try
+        if number % 3 == 0:
+            entry.insert(0, str(answer + 1))
+            timer.measure("quiz: wrong answer (Return)",
+                          lambda: entry.event_generate("<Return>"))
+            entry.delete(0, "end")
+        entry.insert(0, str(answer))
+        timer.measure("quiz: submit answer (Return)",
+                      lambda: entry.event_generate("<Return>"))
+
+        # Run the delayed show_question (or displayResults after the last one)
+        while delayed:
+            func, args = delayed.pop(0)
+            name = "quiz: displayResults" if number == 9 else "quiz: show_question"
+            timer.measure(name, lambda: func(*args))
+
+    timer.measure("quiz: Play Again (displayMenu)",
+                  lambda: click(find_widget(quiz.task_frame, Button, "Play Again")))
+    timer.measure("quiz: Back to Home (show_frame)",
+                  lambda: click(find_widget(quiz.task_frame, Button, "Back to Home")))
+    timer.measure("launcher: show_menu", launcher.show_menu)
+
+
+def joke_cycle(timer, launcher, jokes, jokes_per_cycle=5):
+    """
+    Home -> joke screen -> several jokes with punchlines -> home.
+    """
+    timer.measure("launcher: open Joke Assistant",
+                  lambda: launcher.open_exercise(*launcher.EXERCISES[1][1:]))
+    timer.measure("jokes: Start Laughing (show_frame)",
+                  lambda: click(find_widget(jokes.home_frame, Button, "Start Laughing")))
+    timer.measure("jokes: Alexa tell me a Joke (get_random_joke)",
+                  lambda: click(find_widget(jokes.joke_frame, Button, "Alexa tell me a Joke")))
+
+    for _ in range(jokes_per_cycle):
+        timer.measure("jokes: Show Punchline (show_punchline)",
+                      lambda: click(jokes.punchline_button))
+        timer.measure("jokes: Next Joke (get_random_joke)",
+                      lambda: click(find_widget(jokes.joke_frame, Button, "Next Joke")))
+
+    timer.measure("jokes: Home (go_home)",
+                  lambda: click(find_widget(jokes.joke_frame, Button, "Home")))
+    timer.measure("launcher: show_menu", launcher.show_menu)
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def git_commit():
+    """
+    Returns the current git commit, or None outside a git checkout.
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=script_dir,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=20,
+                        help="number of quiz + joke cycles to run")
+    parser.add_argument("--sample-every", type=int, default=5,
+                        help="record widgets and RSS every N cycles")
+    parser.add_argument("--output", default="gui_benchmark.json",
+                        help="where to write the JSON results")
+    options = parser.parse_args()
+
+    # Jokes are rendered to speech but not played during the benchmark,
+    # and benchmark clicks must not go into a user's session recording
+    os.environ.setdefault("ALEXA_VOICE", "silent")
+    os.environ.pop("SESSION_RECORD", None)
+
+    xvfb = start_virtual_display()
+    try:
+        import launcher
+
+        root = launcher.build_launcher()
+        root.update()
+
+        # Build both exercises once so their modules can be driven directly
+        launcher.open_exercise(*launcher.EXERCISES[0][1:])
+        launcher.open_exercise(*launcher.EXERCISES[1][1:])
+        quiz = sys.modules["mathsquiz"]
+        jokes = sys.modules["alexajoke"]
+        launcher.show_menu()
+
+        delayed = capture_delayed_calls(quiz)
+        timer = TransitionTimer(root)
+        samples = []
+        difficulties = ["Easy", "Moderate", "Advanced"]
+
+        started = time.perf_counter()
+        for cycle in range(options.cycles):
+            quiz_cycle(timer, launcher, quiz, delayed, difficulties[cycle % 3])
+            joke_cycle(timer, launcher, jokes)
+            if cycle % options.sample_every == 0 or cycle == options.cycles - 1:
+                root.update()
+                samples.append({"cycle": cycle,
+                                "widgets": count_widgets(root),
+                                "rss_kb": rss_kb()})
+
+        results = {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "tk": root.tk.call("info", "patchlevel"),
+            "cycles": options.cycles,
+            "seconds": time.perf_counter() - started,
+            "transitions": timer.summary(),
+            "samples": samples,
+        }
+        root.destroy()
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+
+    with open(options.output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+
+    for name, stats in results["transitions"].items():
+        print(f"{name:<48} median {stats['median_ms']:7.2f} ms   p95 {stats['p95_ms']:7.2f} ms")
+    first, last = samples[0], samples[-1]
+    print(f"widgets {first['widgets']} -> {last['widgets']},  "
+          f"RSS {first['rss_kb']} -> {last['rss_kb']} KB")
+    print(f"Results written to {options.output}")
+
+
+if __name__ == "__main__":
+    main()
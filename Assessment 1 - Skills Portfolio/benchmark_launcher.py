@@ -0,0 +1,101 @@
+"""
+Startup benchmark for launcher.py
+
+Each measurement runs in a fresh Python process so imports are cold.
+It reports:
+  - import time of each exercise module (now free of GUI work)
+  - time to first paint of the launcher menu
+  - time to first paint when every exercise is built up front, which is
+    what starting both apps used to cost
+  - time to open each exercise for the first time from the launcher
+
+Needs a display (use xvfb-run on a headless machine).
+Usage: python benchmark_launcher.py [repeats]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Code run in the child process for each measurement. It prints the
+# elapsed seconds as JSON.
+SETUP = f"""
+import time
+started = time.perf_counter()
+import sys
+sys.path.insert(0, {script_dir!r})
+"""
+
+SCENARIOS = {
+    "import mathsquiz": """
+import launcher
+launcher.load_exercise("Exercise 1 - Maths Quiz", "mathsquiz")
+""",
+    "import alexajoke": """
+import launcher
+launcher.load_exercise("Exercise 2 - Alexa tell me a joke", "alexajoke")
+""",
+    "launcher first paint": """
+import launcher
+root = launcher.build_launcher()
+root.update()
+""",
+    "eager first paint (all exercises built)": """
+import launcher
+root = launcher.build_launcher()
+for text, folder, module, size, title in launcher.EXERCISES:
+    launcher.open_exercise(folder, module, size, title)
+launcher.show_menu()
+root.update()
+""",
+    "open Maths Quiz from launcher": """
+import launcher
+root = launcher.build_launcher()
+root.update()
+started = time.perf_counter()
+launcher.open_exercise(*launcher.EXERCISES[0][1:])
+root.update()
+""",
+    "open Alexa Joke from launcher": """
+import launcher
+root = launcher.build_launcher()
+root.update()
+started = time.perf_counter()
+launcher.open_exercise(*launcher.EXERCISES[1][1:])
+root.update()
+""",
+}
+
+REPORT = """
+import json
+print(json.dumps(time.perf_counter() - started))
+root = globals().get("root")
+if root is not None:
+    root.destroy()
+"""
+
+
+def run_scenario(code):
+    """
+    Runs one scenario in a new interpreter and returns its time in seconds.
+    """
+    output = subprocess.run([sys.executable, "-c", SETUP + code + REPORT],
+                            capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    results = {}
+    for name, code in SCENARIOS.items():
+        times = [run_scenario(code) for _ in range(repeats)]
+        results[name] = statistics.median(times)
+        print(f"{name:<42} {results[name] * 1000:8.1f} ms")
+    return results
+
+
+if __name__ == "__main__":
+    main()
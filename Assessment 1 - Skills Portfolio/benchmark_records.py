@@ -0,0 +1,104 @@
+"""
+Memory benchmark for the compact question and joke records
+
+Builds 1,000,000 questions and 1,000,000 jokes twice, once the old way
+(a list of tuples holding strings) and once with QuestionSet and
+JokeList, and uses tracemalloc to report the bytes used per item.
+
+Usage: python benchmark_records.py [items]
+"""
+import os
+import random
+import sys
+import tracemalloc
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(script_dir, "Exercise 1 - Maths Quiz"))
+sys.path.append(os.path.join(script_dir, "Exercise 2 - Alexa tell me a joke"))
+
+from questionset import QuestionSet
+from jokelist import JokeList
+
+
+def read_joke_lines():
+    """
+    Returns the (setup, punchline) pairs from randomJokes.txt, used as
+    templates so the benchmark jokes have realistic lengths.
+    """
+    filename = os.path.join(script_dir, "Exercise 2 - Alexa tell me a joke", "randomJokes.txt")
+    pairs = []
+    with open(filename, "r", encoding="utf-8") as file:
+        for line in file:
+            if "?" in line:
+                setup, punchline = line.strip().split("?", 1)
+                pairs.append((setup.strip(), punchline.strip()))
+    return pairs
+
+
+def measure(build):
+    """
+    Returns (object, bytes allocated) for calling build().
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def old_questions(count):
+    questions = []
+    for _ in range(count):
+        num1, num2 = random.randint(10, 99), random.randint(10, 99)
+        operation = random.choice("+-")
+        question = f"{num1} {operation} {num2}"
+        answer = num1 + num2 if operation == "+" else num1 - num2
+        questions.append((question, answer))
+    return questions
+
+
+def new_questions(count):
+    questions = QuestionSet()
+    for _ in range(count):
+        questions.add(random.randint(10, 99), random.choice("+-"), random.randint(10, 99))
+    return questions
+
+
+def old_jokes(count, pairs):
+    # Each joke is made unique (like a real corpus) by adding its number
+    jokes = []
+    for number in range(count):
+        setup, punchline = pairs[number % len(pairs)]
+        jokes.append((f"{setup} {number}" + "?", f"{punchline} {number}"))
+    return jokes
+
+
+def new_jokes(count, pairs):
+    jokes = JokeList()
+    for number in range(count):
+        setup, punchline = pairs[number % len(pairs)]
+        jokes.add(f"{setup} {number}" + "?", f"{punchline} {number}")
+    return jokes
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    pairs = read_joke_lines()
+
+    rows = [
+        ("questions: list of tuples", lambda: old_questions(count)),
+        ("questions: QuestionSet", lambda: new_questions(count)),
+        ("jokes: list of tuples", lambda: old_jokes(count, pairs)),
+        ("jokes: JokeList", lambda: new_jokes(count, pairs)),
+    ]
+
+    print(f"{count:,} items each")
+    for name, build in rows:
+        result, used = measure(build)
+        print(f"{name:<28} {used / count:8.1f} bytes per item  ({used / 1024 / 1024:7.1f} MiB)")
+        del result
+
+
+if __name__ == "__main__":
+    main()
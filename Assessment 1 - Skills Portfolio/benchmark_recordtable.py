@@ -0,0 +1,156 @@
+"""
+Frame time benchmark for the virtual student records table
+
+Builds a marks store with 1,000,000 random students (or the number
+given), shows it sorted by name in a VirtualTable and times how long
+each kind of scroll takes until the table is redrawn and Tk is idle:
+one row, a page, a scrollbar jump to a random place and a burst of
+mouse wheel notches. A steady 60 frames per second needs every redraw
+to finish within 16.7 ms.
+
+The data side of a frame (fetching the 15 visible rows through the
+sorted permutation) is always timed. The window itself needs a display;
+if DISPLAY isn't set and Xvfb is installed a virtual display is used,
+otherwise only the data side is measured.
+
+Usage: python benchmark_recordtable.py [rows] [frames]
+"""
+import os
+import random
+import shutil
+import statistics
+import sys
+import time
+from tkinter import Tk, TclError
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(script_dir, "Exercise 3 - Student Manager"))
+
+from benchmark_gui import count_widgets, rss_kb, start_virtual_display
+from marksengine import MarksStore
+from recordtable import VirtualTable
+
+FIRST_NAMES = ["Ann", "Bob", "Cara", "Dev", "Eve", "Finn", "Gita", "Hal", "Ines", "Jon"]
+LAST_NAMES = ["Smith", "Jones", "Lee", "Patel", "Nowak", "Garcia", "Kim", "Brown"]
+
+# Time for one frame at 60 frames per second
+FRAME_BUDGET_MS = 1000 / 60
+
+COLUMNS = [("Name", 200), ("Number", 90), ("Coursework", 110), ("Exam", 80),
+           ("Overall", 90), ("Grade", 70)]
+
+
+def build_store(rows):
+    """
+    Returns a store holding rows random students.
+    """
+    generator = random.Random(1)
+    store = MarksStore()
+    for number in range(rows):
+        name = f"{generator.choice(FIRST_NAMES)} {generator.choice(LAST_NAMES)} {number}"
+        store.add_record(1000 + number, name, generator.randint(0, 20),
+                         generator.randint(0, 20), generator.randint(0, 20),
+                         generator.randint(0, 100))
+    return store
+
+
+def report(name, times):
+    """
+    Prints the median, 95th percentile and worst time of a list of ms.
+    """
+    ordered = sorted(times)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    within = sum(1 for value in ordered if value <= FRAME_BUDGET_MS) / len(ordered) * 100
+    print(f"{name:<32} median {statistics.median(ordered):7.3f} ms   p95 {p95:7.3f} ms   "
+          f"max {ordered[-1]:7.3f} ms   {within:5.1f}% within 16.7 ms")
+
+
+def time_frames(action, frames):
+    """
+    Calls action frames times and returns how long each call took in ms.
+    """
+    times = []
+    for frame in range(frames):
+        started = time.perf_counter()
+        action(frame)
+        times.append((time.perf_counter() - started) * 1000)
+    return times
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    frames = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    generator = random.Random(2)
+
+    started = time.perf_counter()
+    store = build_store(rows)
+    print(f"Built {rows:,} students in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    order = store.sorted_indexes("name")
+    print(f"Sorted by name in {time.perf_counter() - started:.2f}s\n")
+
+    def get_row(row):
+        name, code, coursework, exam, percentage, grade = store.get_record(order[row])
+        return (name, code, coursework, exam, f"{percentage:.1f}%", grade)
+
+    visible_rows = 15
+    last_start = rows - visible_rows
+
+    def fetch_rows(frame):
+        first = generator.randint(0, last_start)
+        for row in range(first, first + visible_rows):
+            get_row(row)
+
+    report("data: rows for one frame", time_frames(fetch_rows, frames))
+
+    xvfb = None
+    if not os.environ.get("DISPLAY") and shutil.which("Xvfb"):
+        xvfb = start_virtual_display()
+    try:
+        root = Tk()
+    except TclError:
+        print("\nNo display: the window redraws are not included")
+        return
+
+    try:
+        table = VirtualTable(root, columns=COLUMNS, row_count=rows, get_row=get_row,
+                             visible_rows=visible_rows)
+        table.pack()
+        root.update()
+        widgets = count_widgets(root)
+        items = len(table.canvas.find_all())
+        memory = rss_kb()
+
+        def redraw(action):
+            def frame(number):
+                action()
+                root.update()
+            return frame
+
+        print()
+        report("window: scroll one row",
+               time_frames(redraw(lambda: table.scroll_by(1)), frames))
+        report("window: page down",
+               time_frames(redraw(lambda: table.scroll_by(visible_rows)), frames))
+        report("window: scrollbar jump",
+               time_frames(redraw(lambda: table._on_scrollbar("moveto", generator.random())),
+                           frames))
+
+        def wheel_burst():
+            for _ in range(10):
+                table.scroll_by(3)
+
+        report("window: 10 wheel notches", time_frames(redraw(wheel_burst), frames))
+
+        print(f"\nWidgets {widgets} -> {count_widgets(root)}, canvas items "
+              f"{items} -> {len(table.canvas.find_all())}, "
+              f"RSS {memory:,} KB -> {rss_kb():,} KB")
+    finally:
+        root.destroy()
+        if xvfb is not None:
+            xvfb.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+from tkinter import *
+import importlib
+import os
+import sys
+
+import sessionrecorder
+
+# Folder this script is located in
+script_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Exercises the launcher can open: (button text, folder, module, window size, title)
+EXERCISES = [
+    ("Maths Quiz", "Exercise 1 - Maths Quiz", "mathsquiz", "700x500", "Maths Quiz"),
+    ("Alexa tell me a Joke", "Exercise 2 - Alexa tell me a joke", "alexajoke",
+     "800x600", "🎭 Alexa Joke Assistant 🎭"),
+]
+
+LAUNCHER_SIZE = "500x400"
+
+# Main window and launcher menu, created by build_launcher()
+root = None
+menu_frame = None
+
+# Frames of exercises that have already been opened, keyed by module name
+# Each exercise is only imported and built the first time it is opened
+built_exercises = {}
+
+# ============================================================================
+# LAZY LOADING
+# ============================================================================
+
+def load_exercise(folder, module_name):
+    """
+    Imports an exercise module the first time it is needed.
+    """
+    exercise_dir = os.path.join(script_dir, folder)
+    if exercise_dir not in sys.path:
+        sys.path.insert(0, exercise_dir)
+    return importlib.import_module(module_name)
+
+
+def open_exercise(folder, module_name, size, title):
+    """
+    Shows an exercise, importing it and building its frames on first use.
+    """
+    container = built_exercises.get(module_name)
+    if container is None:
+        module = load_exercise(folder, module_name)
+        container = Frame(root)
+        container.place(relwidth=1, relheight=1)
+        module.build_app(container, on_exit=show_menu)
+        built_exercises[module_name] = container
+
+    root.title(title)
+    root.geometry(size)
+    container.tkraise()
+
+
+def show_menu():
+    """
+    Goes back to the launcher menu.
+    """
+    root.title("Skills Portfolio")
+    root.geometry(LAUNCHER_SIZE)
+    menu_frame.tkraise()
+
+
+# ============================================================================
+# LAUNCHER MENU
+# ============================================================================
+
+def build_launcher():
+    """
+    Creates the window and the launcher menu. Nothing from the exercises
+    is imported here, so the menu appears straight away.
+    """
+    global root, menu_frame
+
+    # Record the session if SESSION_RECORD is set (see sessionrecorder.py)
+    sessionrecorder.start_from_environment()
+
+    root = Tk()
+    root.title("Skills Portfolio")
+    root.geometry(LAUNCHER_SIZE)
+    root.resizable(False, False)
+
+    menu_frame = Frame(root, bg="#e0f2fe")
+    menu_frame.place(relwidth=1, relheight=1)
+
+    Label(menu_frame, text="Skills Portfolio",
+          font=("Arial", 28, "bold"),
+          bg="#e0f2fe", fg="#0c4a6e").pack(pady=40)
+
+    for text, folder, module_name, size, title in EXERCISES:
+        Button(menu_frame, text=text,
+               font=("Arial", 14, "bold"),
+               bg="#3b82f6", fg="white",
+               width=22, height=2,
+               command=lambda f=folder, m=module_name, s=size, t=title:
+                   open_exercise(f, m, s, t)).pack(pady=10)
+
+    Button(menu_frame, text="Quit",
+           font=("Arial", 12),
+           bg="#ef4444", fg="white",
+           width=12,
+           command=root.quit).pack(pady=20)
+
+    return root
+
+
+if __name__ == "__main__":
+    build_launcher().mainloop()
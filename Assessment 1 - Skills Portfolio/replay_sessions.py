@@ -0,0 +1,412 @@
+"""
+Replays recorded sessions to load test the Maths Quiz and Joke Assistant
+
+Sessions are recorded with sessionrecorder.py (set SESSION_RECORD to a
+file name before starting an app). Each replay copy runs the launcher in
+its own process and feeds the recorded events back as synthesized
+clicks and key presses:
+
+    difficulty  clicks the difficulty button on the quiz menu
+    answer      types an answer into the quiz and presses Return
+                (the right answer, or a wrong one, as recorded)
+    joke        clicks "Alexa tell me a Joke"
+    punchline   clicks "Show Punchline"
+    next        clicks "Next Joke"
+
+Events are replayed at the recorded speed (--speed 1), faster or slower
+(--speed 2, --speed 0.5) or as fast as possible (--speed 0). Each event
+is timed until Tk is idle again, and the run reports events per second
+and latency per event type.
+
+If DISPLAY isn't set, or --xvfb is given, all copies share a virtual X
+server (Xvfb), so replays can run on a headless machine.
+
+With --headless no window is made at all: events are fed straight to
+the quiz and joke logic (new_quiz, mark_answer, pick_joke, ...), so no X
+server is needed. This times the apps' own work, such as making
+questions, scoring and loading joke shards, without the drawing.
+
+Usage:
+    python replay_sessions.py session.log [more.log ...] [--copies N]
+                              [--speed 1] [--repeat 1] [--headless]
+                              [--output results.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from tkinter import Button, Entry
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, script_dir)
+
+from benchmark_gui import TransitionTimer, capture_delayed_calls, click, find_widget
+from benchmark_gui import rss_kb, start_virtual_display
+from sessionrecorder import read_session
+
+# ============================================================================
+# ONE REPLAY COPY
+# ============================================================================
+
+class BaseReplayer:
+    """
+    Plays recorded events in time. Subclasses say how each event is
+    played (play), how to wait for the next one (wait_until) and what
+    to do at the end (finish, close).
+    """
+
+    def play(self, event, value):
+        raise NotImplementedError
+
+    def wait_until(self, due):
+        time.sleep(max(0, due - time.perf_counter()))
+
+    def finish(self):
+        pass
+
+    def close(self):
+        pass
+
+    def replay(self, filenames, speed, repeat):
+        """
+        Replays every file in turn, repeat times. Returns the results.
+
+        Parameters:
+            filenames: Recorded session files
+            speed: 1 for recorded speed, 2 for twice as fast, 0 for no waiting
+            repeat: How many times to play the files
+        """
+        events = 0
+        started = time.perf_counter()
+        due = started
+
+        for _ in range(repeat):
+            for filename in filenames:
+                for delay, event, value in read_session(filename):
+                    if speed > 0:
+                        due += delay / speed
+                        self.wait_until(due)
+                    self.play(event, value)
+                    events += 1
+
+        self.finish()
+        elapsed = time.perf_counter() - started
+        results = {
+            "events": events,
+            "skipped": self.skipped,
+            "seconds": elapsed,
+            "events_per_second": events / elapsed if elapsed else 0,
+            "rss_kb": rss_kb(),
+            "latency_ms": {name: times for name, times in self.timer.times.items()},
+        }
+        self.close()
+        return results
+
+
+class Replayer(BaseReplayer):
+    """
+    Drives the launcher's two apps from a stream of recorded events.
+    """
+
+    def __init__(self):
+        import launcher
+
+        self.launcher = launcher
+        self.root = launcher.build_launcher()
+        launcher.open_exercise(*launcher.EXERCISES[0][1:])
+        launcher.open_exercise(*launcher.EXERCISES[1][1:])
+        self.quiz = sys.modules["mathsquiz"]
+        self.jokes = sys.modules["alexajoke"]
+        launcher.show_menu()
+        self.root.update()
+
+        # The quiz's 1-2 second waits are run by the replayer when the
+        # next quiz event arrives (the recorded delays already include them)
+        self.delayed = capture_delayed_calls(self.quiz)
+        self.current_app = None
+        self.timer = TransitionTimer(self.root)
+        self.skipped = 0
+
+    def open_app(self, number):
+        """
+        Switches the launcher to exercise number (0 quiz, 1 jokes) if it
+        isn't showing already.
+        """
+        if self.current_app != number:
+            self.launcher.open_exercise(*self.launcher.EXERCISES[number][1:])
+            self.current_app = number
+
+    def run_delayed(self):
+        """
+        Runs the quiz's waiting show_question/displayResults calls.
+        """
+        while self.delayed:
+            func, args = self.delayed.pop(0)
+            self.timer.measure("quiz: show_question", lambda: func(*args))
+
+    def play(self, event, value):
+        """
+        Replays one event. Events that can't happen in the app's current
+        state (e.g. an answer after the quiz has ended) are skipped.
+        """
+        quiz, jokes = self.quiz, self.jokes
+
+        if event == "difficulty":
+            self.open_app(0)
+            self.run_delayed()
+            quiz.show_frame(quiz.task_frame)
+            quiz.displayMenu()
+            button = find_widget(quiz.task_frame, Button, value)
+            self.timer.measure(f"quiz: pick {value}", lambda: click(button))
+
+        elif event == "answer":
+            self.open_app(0)
+            self.run_delayed()
+            entry = find_widget(quiz.task_frame, Entry)
+            if quiz.current_index >= len(quiz.current_questions) or entry is None:
+                self.skipped += 1
+                return
+            answer = quiz.current_questions[quiz.current_index][1]
+            right = value.split(" ", 1)[0] == "1"
+            entry.delete(0, "end")
+            entry.insert(0, str(answer if right else answer + 1))
+            self.timer.measure("quiz: submit answer",
+                               lambda: entry.event_generate("<Return>"))
+
+        elif event in ("joke", "next"):
+            self.open_app(1)
+            jokes.start_joke_app()
+            text = "Alexa tell me a Joke" if event == "joke" else "Next Joke"
+            button = find_widget(jokes.joke_frame, Button, text)
+            self.timer.measure(f"jokes: {text}", lambda: click(button))
+
+        elif event == "punchline":
+            self.open_app(1)
+            # Clicking again would open a "already shown" message box
+            if jokes.current_joke is None or jokes.punchline_shown:
+                self.skipped += 1
+                return
+            self.timer.measure("jokes: Show Punchline",
+                               lambda: click(jokes.punchline_button))
+
+    def wait_until(self, due):
+        # Keep Tk running while waiting for the event's time
+        while time.perf_counter() < due:
+            self.root.update()
+            time.sleep(min(0.002, max(0, due - time.perf_counter())))
+
+    def finish(self):
+        self.run_delayed()
+
+    def close(self):
+        self.root.destroy()
+
+
+class CallTimer:
+    """
+    Collects how long each named call takes, for replays with no window.
+    """
+
+    def __init__(self):
+        self.times = {}
+
+    def measure(self, name, action):
+        started = time.perf_counter()
+        action()
+        elapsed = (time.perf_counter() - started) * 1000
+        self.times.setdefault(name, []).append(elapsed)
+
+
+class HeadlessReplayer(BaseReplayer):
+    """
+    Feeds recorded events straight to the quiz and joke logic without
+    building any widgets, so it runs without a display.
+    """
+
+    def __init__(self):
+        import launcher
+
+        self.quiz = launcher.load_exercise(*launcher.EXERCISES[0][1:3])
+        self.jokes = launcher.load_exercise(*launcher.EXERCISES[1][1:3])
+        self.jokes.load_jokes()
+        self.timer = CallTimer()
+        self.skipped = 0
+
+    def answer(self, right):
+        """
+        Answers the current question right or wrong, like typing an
+        answer and pressing Return, and finishes the quiz after the last one.
+        """
+        quiz = self.quiz
+        question_index = quiz.current_index
+        question, answer = quiz.current_question()
+        quiz.mark_answer(question_index, answer if right else answer + 1, answer)
+        if quiz.current_index >= quiz.QUESTIONS_PER_QUIZ:
+            quiz.save_session(quiz.current_score)
+            quiz.get_rank(quiz.current_score)
+
+    def show_punchline(self):
+        self.jokes.punchline_shown = True
+        return self.jokes.current_joke[1]
+
+    def play(self, event, value):
+        """
+        Replays one event. As with the window, events that can't happen
+        in the app's current state are skipped.
+        """
+        quiz, jokes = self.quiz, self.jokes
+
+        if event == "difficulty":
+            self.timer.measure(f"quiz: pick {value}", lambda: quiz.new_quiz(value))
+
+        elif event == "answer":
+            if not quiz.current_difficulty or quiz.current_index >= quiz.QUESTIONS_PER_QUIZ:
+                self.skipped += 1
+                return
+            right = value.split(" ", 1)[0] == "1"
+            self.timer.measure("quiz: submit answer", lambda: self.answer(right))
+
+        elif event in ("joke", "next"):
+            if not jokes.jokes_list:
+                self.skipped += 1
+                return
+            text = "Alexa tell me a Joke" if event == "joke" else "Next Joke"
+            self.timer.measure(f"jokes: {text}", jokes.pick_joke)
+
+        elif event == "punchline":
+            if jokes.current_joke is None or jokes.punchline_shown:
+                self.skipped += 1
+                return
+            self.timer.measure("jokes: Show Punchline", self.show_punchline)
+
+
+def run_copy(options):
+    """
+    Runs one replay copy and prints its results as JSON.
+    """
+    replayer = HeadlessReplayer() if options.headless else Replayer()
+    results = replayer.replay(options.sessions, options.speed, options.repeat)
+    print(json.dumps(results))
+
+
+# ============================================================================
+# MANY COPIES
+# ============================================================================
+
+def percentile(ordered, share):
+    """
+    Returns the value share of the way through a sorted list.
+    """
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+
+def combine(copies, wall_seconds):
+    """
+    Combines the results of all copies into one report.
+    """
+    latencies = {}
+    for copy in copies:
+        for name, times in copy["latency_ms"].items():
+            latencies.setdefault(name, []).extend(times)
+
+    events = sum(copy["events"] for copy in copies)
+    summary = {}
+    for name, times in sorted(latencies.items()):
+        ordered = sorted(times)
+        summary[name] = {
+            "count": len(ordered),
+            "median_ms": statistics.median(ordered),
+            "p95_ms": percentile(ordered, 0.95),
+            "p99_ms": percentile(ordered, 0.99),
+            "max_ms": ordered[-1],
+        }
+
+    return {
+        "copies": len(copies),
+        "events": events,
+        "skipped": sum(copy["skipped"] for copy in copies),
+        "seconds": wall_seconds,
+        "events_per_second": events / wall_seconds if wall_seconds else 0,
+        "per_copy_events_per_second": [copy["events_per_second"] for copy in copies],
+        "rss_kb": [copy["rss_kb"] for copy in copies],
+        "latency": summary,
+    }
+
+
+def run_copies(options):
+    """
+    Starts options.copies replay processes at once and waits for them all.
+    """
+    command = [sys.executable, os.path.abspath(__file__), "--worker",
+               "--speed", str(options.speed), "--repeat", str(options.repeat)]
+    if options.headless:
+        command.append("--headless")
+    command += [os.path.abspath(name) for name in options.sessions]
+
+    # Replays must not record themselves, or talk
+    environment = dict(os.environ)
+    environment.pop("SESSION_RECORD", None)
+    environment["ALEXA_VOICE"] = "silent"
+
+    started = time.perf_counter()
+    processes = [subprocess.Popen(command, stdout=subprocess.PIPE, text=True,
+                                  env=environment)
+                 for _ in range(options.copies)]
+    copies = []
+    for process in processes:
+        output, _ = process.communicate()
+        if process.returncode != 0:
+            sys.exit(f"A replay copy failed (exit code {process.returncode})")
+        copies.append(json.loads(output.strip().splitlines()[-1]))
+    return combine(copies, time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded app sessions")
+    parser.add_argument("sessions", nargs="+", help="recorded session files")
+    parser.add_argument("--copies", type=int, default=1,
+                        help="number of replays to run at the same time")
+    parser.add_argument("--speed", type=float, default=1,
+                        help="1 for recorded speed, 0 for as fast as possible")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="times each copy plays the sessions")
+    parser.add_argument("--xvfb", action="store_true",
+                        help="use a virtual display even if DISPLAY is set")
+    parser.add_argument("--headless", action="store_true",
+                        help="feed events to the app logic with no window or X server")
+    parser.add_argument("--output", help="where to write the JSON results")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    options = parser.parse_args()
+
+    if options.worker:
+        run_copy(options)
+        return
+
+    xvfb = None
+    if not options.headless:
+        if options.xvfb:
+            os.environ.pop("DISPLAY", None)
+        xvfb = start_virtual_display()
+    try:
+        results = run_copies(options)
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    print(f"{results['copies']} copies, {results['events']} events in "
+          f"{results['seconds']:.1f}s ({results['events_per_second']:.1f} events/s, "
+          f"{results['skipped']} skipped)")
+    for name, stats in results["latency"].items():
+        print(f"{name:<32} median {stats['median_ms']:7.2f} ms   "
+              f"p95 {stats['p95_ms']:7.2f} ms   p99 {stats['p99_ms']:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Opt-in recorder for what users do in the Maths Quiz and the Joke Assistant
+
+Nothing is recorded unless the SESSION_RECORD environment variable is
+set to a file name when an app or the launcher is started (or
+start_recording() is called). Each event is one short line:
+milliseconds since the previous event, a one letter code and a value,
+e.g.
+
+    1520 d Easy
+    3210 a 1 42
+    880 j
+
+replay_sessions.py plays recorded files back to load test the apps.
+"""
+import os
+import time
+
+# Event name -> one letter code written to the file
+EVENT_CODES = {
+    "difficulty": "d",  # Quiz difficulty picked (value: Easy, Moderate, Advanced, Adaptive)
+    "answer": "a",      # Quiz answer submitted (value: 1 or 0 for right/wrong, then the answer)
+    "joke": "j",        # "Alexa tell me a Joke" clicked
+    "punchline": "p",   # "Show Punchline" clicked
+    "next": "n",        # "Next Joke" clicked
+}
+EVENT_NAMES = {code: name for name, code in EVENT_CODES.items()}
+
+HEADER = "# session v1"
+
+# Open recording file and when the last event happened, or None when
+# not recording
+record_file = None
+last_event = None
+
+# ============================================================================
+# RECORDING
+# ============================================================================
+
+def start_recording(filename):
+    """
+    Starts recording events, adding them to the end of filename.
+    """
+    global record_file, last_event
+    stop_recording()
+
+    # Line buffered so nothing is lost if the app is closed suddenly
+    record_file = open(filename, "a", encoding="utf-8", buffering=1)
+    record_file.write(f"{HEADER} {time.strftime('%Y-%m-%dT%H:%M:%S')}\n")
+    last_event = time.monotonic()
+
+
+def start_from_environment():
+    """
+    Starts recording if SESSION_RECORD is set. Called by the apps' and
+    the launcher's startup code, not on import, so tools that only
+    import the apps never record.
+    """
+    filename = os.environ.get("SESSION_RECORD")
+    if filename and record_file is None:
+        start_recording(filename)
+
+
+def stop_recording():
+    """
+    Stops recording and closes the file.
+    """
+    global record_file
+    if record_file is not None:
+        record_file.close()
+        record_file = None
+
+
+def record(event, value=""):
+    """
+    Writes one event if recording is on. Does nothing otherwise.
+
+    Parameters:
+        event: One of the names in EVENT_CODES
+        value: Text stored with the event (no new lines)
+    """
+    global last_event
+    if record_file is None:
+        return
+
+    now = time.monotonic()
+    delay = round((now - last_event) * 1000)
+    last_event = now
+    record_file.write(f"{delay} {EVENT_CODES[event]} {value}".rstrip() + "\n")
+
+
+# ============================================================================
+# READING
+# ============================================================================
+
+def read_session(filename):
+    """
+    Generator of (delay in seconds, event name, value) for every event
+    in a recorded file. Header lines are skipped, so files holding
+    several recordings read as one stream.
+    """
+    with open(filename, "r", encoding="utf-8") as file:
+        for line in file:
+            if not line.strip() or line.startswith("#"):
+                continue
+            delay, code, *value = line.rstrip("\n").split(" ", 2)
+            yield int(delay) / 1000, EVENT_NAMES[code], value[0] if value else ""
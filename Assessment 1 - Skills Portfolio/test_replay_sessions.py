@@ -0,0 +1,22 @@
+from replay_sessions import HeadlessReplayer
+
+
+def test_headless_replay_plays_quiz_and_jokes(tmp_path):
+    session = tmp_path / "session.log"
+    lines = ["# session v1 2026-01-01T09:00:00", "900 d Easy",
+             "2000 a 0 7", "1500 a 1 8"]          # Second attempt: 5 points
+    lines += ["1200 a 1 3"] * 9                    # First attempt: 10 points each
+    lines += ["800 a 1 4",                         # Quiz already over
+              "700 j", "1500 p", "300 p",          # Punchline already shown
+              "900 n", "1100 p"]
+    session.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    replayer = HeadlessReplayer()
+    results = replayer.replay([str(session)], speed=0, repeat=1)
+
+    assert results["events"] == len(lines) - 1
+    assert results["skipped"] == 2
+    assert replayer.quiz.current_score == 95
+    assert len(results["latency_ms"]["quiz: submit answer"]) == 11
+    assert len(results["latency_ms"]["jokes: Show Punchline"]) == 2
+    assert replayer.jokes.punchline_shown